@@ -0,0 +1,223 @@
+"""
+Batch runner for the leader ablations.
+
+Runs every combination of news date file and leader variant, instead of
+launching leader1.py, leader2.py and leader3.py by hand once per
+NEWS_DATE_FILE. The embedding model, the LLM clients, each date's vector DB
+snapshot and each week's knowledge graph are built once and shared by all
+jobs through agents/registry.py; the agents themselves are built per job.
+
+Jobs run date by date, each date's jobs on a pool of BATCH_WORKERS threads
+(all LLM requests still share the rate limiter in rate_limit.py). Every
+report is written to a fixed path under the output folder, e.g.
+results/batch/23092025_summary_leader2.md, or ..._leader2_3.md for the third
+of several runs. A report that already exists is skipped, so rerunning the
+same command only runs the jobs that are missing or failed.
+
+Usage (from the repository root):
+    python -m agents.batch_runner 16092025.json 23092025.json --leaders 1 2 3 --runs 5
+"""
+import argparse
+import importlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from agents.graph_retriever import build_graph
+from agents.rate_limit import rate_limit_report
+from agents.registry import get, provide
+
+load_dotenv()
+QUERY_DIR = Path("data/query")
+BATCH_OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "results/batch")
+# Jobs of one date running at the same time.
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "2"))
+
+LEADERS = {"leader1": "agents.leader1", "leader2": "agents.leader2", "leader3": "agents.leader3"}
+# Leaders with a graph_retriever, which need the knowledge graph of the week before the date.
+GRAPH_LEADERS = {"leader2", "leader3"}
+
+_WEEK_FILE_PATTERN = re.compile(r"(week\d+)_(\d{2})-(\d{2})_to_(\d{2})-(\d{2})\.json")
+
+
+@dataclass(frozen=True)
+class Job:
+    date: str
+    leader: str
+    run: int
+    output_path: Path
+
+    @property
+    def trace_name(self) -> str:
+        return f"{self.leader.capitalize()}_{news_date(self.date)}" + (f"-{self.run}" if self.run else "")
+
+
+def news_date(date: str) -> str:
+    """Returns a DDMMYYYY date file stem as DD/MM/YYYY, the form the leaders' prompts use."""
+    return date[:2] + '/' + date[2:4] + '/' + date[4:]
+
+
+def graph_week(date: str, query_dir: Path = QUERY_DIR) -> str:
+    """
+    Finds the knowledge graph giving a date its 7 days of history: the last
+    week in data/query (e.g. week1_09-09_to_09-15.json) ending before it.
+
+    Args:
+        date: The news date, DDMMYYYY.
+        query_dir: The folder holding the week files.
+
+    Returns:
+        The week name, e.g. "week1", as used by graph_news/.
+    """
+    day = datetime.strptime(date, "%d%m%Y")
+    weeks = {}
+    for path in query_dir.glob("week*.json"):
+        match = _WEEK_FILE_PATTERN.fullmatch(path.name)
+        if match:
+            end = datetime(day.year, int(match.group(4)), int(match.group(5)))
+            if end < day:
+                weeks[end] = match.group(1)
+    if not weeks:
+        raise FileNotFoundError(f"No week of news in {query_dir} ends before {news_date(date)}.")
+    return weeks[max(weeks)]
+
+
+def plan_jobs(date_files: list[str], leaders: list[str], runs: int, output_dir: Path) -> list[Job]:
+    """
+    Lists every (date, leader, run) job and the report path it writes.
+
+    Args:
+        date_files: News files in data/query, e.g. "23092025.json".
+        leaders: Leader variants, e.g. "leader1".
+        runs: Repeated runs per date and leader.
+        output_dir: The folder the reports are written to.
+
+    Returns:
+        The jobs, grouped by date.
+    """
+    jobs = []
+    for date_file in date_files:
+        date = Path(date_file).stem
+        for leader in leaders:
+            for run in range(1, runs + 1) if runs > 1 else [0]:
+                name = f"{date}_summary_{leader}" + (f"_{run}" if run else "") + ".md"
+                jobs.append(Job(date, leader, run, output_dir / name))
+    return jobs
+
+
+def _write_report(path: Path, report: str):
+    # Written under a temporary name first, so an interrupted run never
+    # leaves a partial report that a rerun would take as done.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    tmp_path.write_text(report, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def run_job(job: Job, news_data: dict) -> bool:
+    """Runs one leader on one date and writes its report. Returns whether it succeeded."""
+    leader = importlib.import_module(LEADERS[job.leader])
+    start = time.perf_counter()
+    try:
+        report = leader.process_request(leader.build_query(news_data, news_date(job.date)), job.trace_name)
+        _write_report(job.output_path, str(report))
+    except Exception as e:
+        print(f"❌ {job.output_path.name} failed: {e}")
+        return False
+    print(f"✅ {job.output_path.name} written in {time.perf_counter() - start:.1f}s")
+    return True
+
+
+def _load_date(date: str, leaders: set[str], graphs: dict):
+    # Points the shared retriever (and graph) of every agent at this date.
+    from chunk_news.vector_db import SNAPSHOT_SUFFIX, get_retriever
+
+    provide("retriever", get_retriever(snapshot=f"{date}{SNAPSHOT_SUFFIX}", embeddings=get("embeddings"), watch=False))
+    if leaders & GRAPH_LEADERS:
+        week = graph_week(date)
+        if week not in graphs:
+            graphs[week] = build_graph(week)
+        provide("knowledge_graph", graphs[week])
+
+
+def run_batch(
+    date_files: list[str],
+    leaders: list[str],
+    runs: int = 1,
+    output_dir: Path = Path(BATCH_OUTPUT_DIR),
+    workers: int = BATCH_WORKERS,
+) -> dict:
+    """
+    Runs every leader on every date file, skipping reports already written.
+
+    Args:
+        date_files: News files in data/query, e.g. "23092025.json".
+        leaders: Leader variants, e.g. "leader1".
+        runs: Repeated runs per date and leader.
+        output_dir: The folder the reports are written to.
+        workers: Jobs of one date running at the same time.
+
+    Returns:
+        Counts of "done", "skipped" and "failed" jobs.
+    """
+    jobs = plan_jobs(date_files, leaders, runs, output_dir)
+    pending = [job for job in jobs if not job.output_path.exists()]
+    counts = {"done": 0, "skipped": len(jobs) - len(pending), "failed": 0}
+    print(f"🔄 {len(jobs)} jobs, {counts['skipped']} already done, {len(pending)} to run")
+
+    graphs = {}
+    for date in dict.fromkeys(job.date for job in pending):
+        date_jobs = [job for job in pending if job.date == date]
+        try:
+            with open(QUERY_DIR / f"{date}.json", "r", encoding="utf-8") as f:
+                news_data = json.load(f)
+            _load_date(date, {job.leader for job in date_jobs}, graphs)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ {news_date(date)} skipped: {e}")
+            counts["failed"] += len(date_jobs)
+            continue
+
+        print(f"🔄 {news_date(date)}: {len(date_jobs)} jobs on {min(workers, len(date_jobs))} workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_job, job, news_data) for job in date_jobs]
+            for future in futures:
+                counts["done" if future.result() else "failed"] += 1
+
+    print(f"-> Batch: {counts['done']} written, {counts['skipped']} skipped, {counts['failed']} failed")
+    print(rate_limit_report())
+    return counts
+
+
+def _leader_name(value: str) -> str:
+    name = value if value.startswith("leader") else f"leader{value}"
+    if name not in LEADERS:
+        raise argparse.ArgumentTypeError(f"unknown leader {value!r}; choose from {', '.join(LEADERS)}")
+    return name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the leader variants over several news date files.")
+    parser.add_argument("date_files", nargs="+", help='news files in data/query, e.g. "23092025.json"')
+    parser.add_argument("--leaders", nargs="+", type=_leader_name, default=list(LEADERS), help="1, 2, 3 or leader1, ...")
+    parser.add_argument("--runs", type=int, default=1, help="repeated runs per date and leader")
+    parser.add_argument("--output", type=Path, default=Path(BATCH_OUTPUT_DIR), help="folder the reports are written to")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="jobs of one date running at once")
+    args = parser.parse_args()
+
+    from langfuse import get_client
+    from openinference.instrumentation.smolagents import SmolagentsInstrumentor
+
+    if get_client().auth_check():
+        print("✅ Langfuse client is authenticated and ready!")
+    else:
+        print("❌ Authentication failed. Please check your credentials and host.")
+    SmolagentsInstrumentor().instrument()
+
+    run_batch(args.date_files, args.leaders, args.runs, args.output, args.workers)
@@ -1,4 +1,6 @@
-from smolagents import OpenAIServerModel, tool, ToolCallingAgent
+from smolagents import tool, ToolCallingAgent
+from agents.rate_limit import gemini_model
+from agents.registry import get
 from ddgs import DDGS
 from dotenv import load_dotenv
 import os
@@ -10,7 +12,6 @@ from urllib.parse import urlparse
 import hashlib
 
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
 TECH_CONTEXT_MAP = {
     # GPU/Hardware Terms
@@ -426,7 +427,21 @@ class EnhancedSearchEngine:
             print(f"Base search error: {e}")
             return []
 
-enhanced_search_engine = EnhancedSearchEngine()
+def build_search_engine() -> EnhancedSearchEngine:
+    return EnhancedSearchEngine()
+
+
+# Built on first use through agents/registry.py.
+_LAZY_ATTRIBUTES = {
+    "enhanced_search_engine": "enhanced_search_engine",
+    "enhanced_search_agent": "enhanced_search_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return get(_LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @tool
 def enhanced_internet_search(
@@ -477,7 +492,7 @@ def enhanced_internet_search(
             min_relevance = max(min_relevance, 0.7)
         
         # Perform enhanced search
-        results = enhanced_search_engine.search(query, max_results, min_relevance)
+        results = get("enhanced_search_engine").search(query, max_results, min_relevance)
         
         if not results:
             return json.dumps([{
@@ -515,49 +530,27 @@ def enhanced_internet_search(
     except Exception as e:
         return json.dumps([{"error": f"Enhanced search failed: {str(e)}"}], indent=2)
 
-@tool
-def delay_tool(seconds: int) -> str:
-    """
-    Pauses the execution for a specified number of seconds.
-    Use this tool to manage rate limits when instructed by the orchestrator.
-
-    Args:
-        seconds (int): The number of seconds to wait.
-
-    Returns:
-        str: A confirmation message that the delay has completed.
-    """
-    print(f"-> Tool 'delay_tool' called. Waiting for {seconds} seconds...")
-    time.sleep(seconds)
-    print("-> Delay finished.")
-    return f"Successfully delayed for {seconds} seconds."
-
-model = OpenAIServerModel(
-    model_id="gemini-2.5-flash",
-    api_base="https://generativelanguage.googleapis.com/v1beta/",
-    api_key=GEMINI_API_KEY,
-)
-
-enhanced_search_agent = ToolCallingAgent(
-    model=model,
-    tools=[delay_tool,enhanced_internet_search],
-    name="Enhanced_Search_Agent",
-    description=(
-        "You are a specialized search tool that ONLY performs internet searches and returns "
-        "the raw JSON search results. Do NOT provide summaries, analysis, or final answers. "
-        "Simply call the enhanced_internet_search tool with the user's query and return the "
-        "JSON results directly. Your job is to retrieve and return search data, not to "
-        "interpret or summarize it."
-    ),
-    stream_outputs=False,
-)
+def build_enhanced_search_agent():
+    return ToolCallingAgent(
+        model=gemini_model("gemini-2.5-flash"),
+        tools=[enhanced_internet_search],
+        name="Enhanced_Search_Agent",
+        description=(
+            "You are a specialized search tool that ONLY performs internet searches and returns "
+            "the raw JSON search results. Do NOT provide summaries, analysis, or final answers. "
+            "Simply call the enhanced_internet_search tool with the user's query and return the "
+            "JSON results directly. Your job is to retrieve and return search data, not to "
+            "interpret or summarize it."
+        ),
+        stream_outputs=False,
+    )
 
 if __name__ == "__main__":
     query = "H200"
     print(f"Testing agent with query: '{query}'")
     
     try:
-        result = enhanced_search_agent.run(f"Please search for: {query}")
+        result = get("enhanced_search_agent").run(f"Please search for: {query}")
         print(f"Agent Result Type: {type(result)}")
 
         print(f"Agent Result:\n{result}")
@@ -1,36 +1,54 @@
-from smolagents import tool, ToolCallingAgent, OpenAIServerModel
-import networkx as nx
+from smolagents import tool, ToolCallingAgent
+from agents.rate_limit import gemini_model
+from agents.registry import get
 import json
 from dotenv import load_dotenv
 import os
+from pathlib import Path
 week = os.getenv("WEEK", "week1")
-with open(fr"graph_news\{week}\{week}.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-G = nx.MultiDiGraph()
-
-for chipmaker in data:
-    for d in data[chipmaker]:
-        date = d['date']
-        for triplet in d['triplets']:
-            subject = triplet['subject']
-            relation = triplet['relation']
-            object_ = triplet['object']
-
-            verb = relation.get("verb")
-            detail = relation.get("detail")
-
-            G.add_edge(
-                subject,
-                object_,
-                key=verb,
-                verb=verb,
-                detail=detail,
-                date=date,
-                chipmaker=chipmaker
-            )
-
-print("✅ Graph loaded with nodes and edges.")
+
+# G and graph_retriever are built on first use through agents/registry.py.
+_LAZY_ATTRIBUTES = {"G": "knowledge_graph", "graph_retriever": "graph_retriever"}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return get(_LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def build_graph(week: str = week):
+    import networkx as nx
+
+    with open(Path("graph_news") / week / f"{week}.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # The week also selects the 7-day summaries the tools read.
+    G = nx.MultiDiGraph(week=week)
+
+    for chipmaker in data:
+        for d in data[chipmaker]:
+            date = d['date']
+            for triplet in d['triplets']:
+                subject = triplet['subject']
+                relation = triplet['relation']
+                object_ = triplet['object']
+
+                verb = relation.get("verb")
+                detail = relation.get("detail")
+
+                G.add_edge(
+                    subject,
+                    object_,
+                    key=verb,
+                    verb=verb,
+                    detail=detail,
+                    date=date,
+                    chipmaker=chipmaker
+                )
+
+    print("✅ Graph loaded with nodes and edges.")
+    return G
 
 @tool
 def get_7day_summary(chipmaker: str) -> str:
@@ -41,7 +59,8 @@ def get_7day_summary(chipmaker: str) -> str:
         chipmaker (str): the name of the chipmaker, e.g., "Nvidia", "AMD", "Intel"
     """
     dict_file = {"AMD":"amd_7day.md", "INTEL":"intel_7day.md", "NVIDIA":"nvidia_7day.md"}
-    with open(fr"graph_news\{week}\{dict_file[chipmaker.upper()]}", "r", encoding="utf-8") as f:
+    week = get("knowledge_graph").graph["week"]
+    with open(Path("graph_news") / week / dict_file[chipmaker.upper()], "r", encoding="utf-8") as f:
         summary = f.read()
         return summary
 
@@ -55,7 +74,8 @@ def get_across_summary() -> str:
     Args:
         None
     """
-    with open(fr"graph_news\{week}\summary.md", mode="r", encoding="utf-8") as f:
+    week = get("knowledge_graph").graph["week"]
+    with open(Path("graph_news") / week / "summary.md", mode="r", encoding="utf-8") as f:
         summary = f.read()
         return summary
 
@@ -68,7 +88,7 @@ def get_entities_from_chipmaker(chipmaker: str) -> list[str]:
         chipmaker (str): the name of the chipmaker, e.g., "Nvidia", "AMD", "Intel"
     """
     nodes = set()
-    for u, v, data in G.edges(data=True):
+    for u, v, data in get("knowledge_graph").edges(data=True):
         if data.get("chipmaker", "").lower() == chipmaker.lower():
             nodes.add(u)
             nodes.add(v)
@@ -83,7 +103,7 @@ def get_relations_from_chipmaker(chipmaker: str) -> list[str]:
         chipmaker (str): the name of the chipmaker, e.g., "Nvidia", "AMD", "Intel"
     """
     relations = set()
-    for _, _, data in G.edges(data=True):
+    for _, _, data in get("knowledge_graph").edges(data=True):
         if data.get("chipmaker", "").lower() == chipmaker.lower():
             relations.add(data.get("verb", ""))
     return list(relations)
@@ -99,7 +119,7 @@ def get_relations_between_entities(chipmaker: str, entity1: str, entity2: str) -
         entity2 (str): the second entity
     """
     relations = []
-    for u, v, data in G.edges(data=True):
+    for u, v, data in get("knowledge_graph").edges(data=True):
         if data.get("chipmaker", "").lower() == chipmaker.lower():
             if (u == entity1 and v == entity2) or (u == entity2 and v == entity1):
                 verb = data.get("verb", "")
@@ -110,27 +130,23 @@ def get_relations_between_entities(chipmaker: str, entity1: str, entity2: str) -
 
 
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-
-model = OpenAIServerModel(
-    model_id="gemini-2.5-flash",
-    api_base="https://generativelanguage.googleapis.com/v1beta/",
-    api_key=GEMINI_API_KEY,
-)
-
-graph_retriever = ToolCallingAgent(
-    model=model,
-    tools=[get_7day_summary, 
-           get_across_summary, 
-           get_entities_from_chipmaker, 
-           get_relations_from_chipmaker, 
-           get_relations_between_entities
-    ],
-    name="graph_retriever",
-    description="Handles graph queries with graph retrieval tools.",
-    stream_outputs=False,
-)
-
-print("✅ Graph Retriever Agent initialized.")
+
+
+def build_graph_retriever():
+    graph_retriever = ToolCallingAgent(
+        model=gemini_model("gemini-2.5-flash"),
+        tools=[get_7day_summary, 
+               get_across_summary, 
+               get_entities_from_chipmaker, 
+               get_relations_from_chipmaker, 
+               get_relations_between_entities
+        ],
+        name="graph_retriever",
+        description="Handles graph queries with graph retrieval tools.",
+        stream_outputs=False,
+    )
+
+    print("✅ Graph Retriever Agent initialized.")
+    return graph_retriever
 
 # graph_retriever.run("Give me a 7-day summary of news for Nvidia. List 5 entities related to Nvidia. List 5 relations related to Nvidia. What are the relations between Nvidia and ARM?")
\ No newline at end of file
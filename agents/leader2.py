@@ -2,58 +2,67 @@
 import os
 import json
 from dotenv import load_dotenv
-from smolagents import OpenAIServerModel, tool, ToolCallingAgent
+from smolagents import tool, ToolCallingAgent
 from openinference.instrumentation.smolagents import SmolagentsInstrumentor
-from agents.worker import summary_worker_agent,analysis_worker_agent
-from agents.graph_retriever import graph_retriever
+from agents.worker import build_summary_worker, build_analysis_worker
+from agents.graph_retriever import build_graph_retriever
+from agents.orchestrator import ORCHESTRATION_MODE, run_specialists
+from agents.rate_limit import rate_limit_report
+from agents.registry import get
+from agents.retrieval_memo import RetrievalMemo
 from langfuse import observe, get_client
 
 load_dotenv()
 NEWS_DATE_FILE = os.getenv("NEWS_DATE_FILE", "") 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-HF_LEADER_MODEL_ID = os.getenv("HF_LEADER_MODEL_ID", "gemini-2.5-flash")
-
-headlines = ""
-data_path = os.path.join("data/query", NEWS_DATE_FILE)
 
 langfuse = get_client()
-if langfuse.auth_check():
-    print("✅ Langfuse client is authenticated and ready!")
-else:
-    print("❌ Authentication failed. Please check your credentials and host.")
-SmolagentsInstrumentor().instrument()
-
-model = OpenAIServerModel(
-    model_id=HF_LEADER_MODEL_ID,
-    api_base="https://generativelanguage.googleapis.com/v1beta/",
-    api_key=GEMINI_API_KEY,
-)
-
-leader = ToolCallingAgent(
-    model=model,
-    tools=[],                 
-    managed_agents=[summary_worker_agent, analysis_worker_agent, graph_retriever],
-    name="Leader2",
-    description="Coordinates tasks and delegates to worker agent",
-    stream_outputs=False,
-)
-print("✅ Leader Agent initialized.")
-
-with open(data_path, 'r', encoding='utf-8') as f:
-    news_data = json.load(f)
-    chipmakers = list(news_data.keys())
-    for chipmaker in chipmakers:
-        headlines += f"\n\n### {chipmaker} ###\n"
-        articles = news_data[chipmaker]
-        for article in articles:
-            headlines += article.get("headline", "") + "\n"
 
-print("✅ News data loaded.")
 
-today = NEWS_DATE_FILE.split('.')[0]
-today = today[:2] + '/' + today[2:4] + '/' + today[4:]
+def build_leader(memo: RetrievalMemo | None = None):
+    """
+    Builds the leader with its own specialists. Agents keep the memory of
+    their current run, so every run gets new ones; the models, retriever and
+    graph behind them are shared through agents/registry.py.
+
+    Args:
+        memo: The run's retrieval memo, shared by the workers' tools.
+
+    Returns:
+        The leader and its specialists.
+    """
+    specialists = [build_summary_worker(memo), build_analysis_worker(memo), build_graph_retriever()]
+
+    leader = ToolCallingAgent(
+        model=get("leader_model"),
+        tools=[],                 
+        # In concurrent mode the leader only writes the report; see orchestrator.py.
+        managed_agents=specialists if ORCHESTRATION_MODE == "sequential" else [],
+        name="Leader2",
+        description="Coordinates tasks and delegates to worker agent",
+        stream_outputs=False,
+    )
+    print("✅ Leader Agent initialized.")
+    return leader, specialists
+
+
+def build_query(news_data: dict, today: str) -> str:
+    """
+    Builds the leader's query for one day of news.
+
+    Args:
+        news_data: Chipmaker -> articles, as in the data/query files.
+        today: The news date, DD/MM/YYYY.
+
+    Returns:
+        The query to run the leader with.
+    """
+    headlines = ""
+    for chipmaker in news_data:
+        headlines += f"\n\n### {chipmaker} ###\n"
+        for article in news_data[chipmaker]:
+            headlines += article.get("headline", "") + "\n"
 
-initial_guide = f"""
+    initial_guide = f"""
 **Input Data:**
 - News Headline: "{headlines}"
 
@@ -63,7 +72,7 @@ initial_guide = f"""
 3. Treat the retrieved context as essential background knowledge. Use it together with the headline to provide a richer, more accurate output.
 """
 
-query = f"""
+    query = f"""
 You are the Leader Agent, an expert orchestrator. Your primary goal is to manage a team of specialist agents to process a news article and produce a combined JSON output.
 
 **Today is {today}.**
@@ -90,14 +99,12 @@ You are the Leader Agent, an expert orchestrator. Your primary goal is to manage
     c. **Find All Related Entities:** Use `get_entities_from_chipmaker` to list all known associated entities (companies, products, people).
     d. **Deep Dive on Relationships:** This is crucial. Identify other key entities mentioned *in the news content*. For each of these secondary entities, use `get_relations_between_entities` to find the precise relationship between the primary company and the secondary entity. This will uncover the direct implications of the news.
     e. **Consolidate Findings:** Combine all retrieved information (summary, entity list, and specific relationships) into a structured context report.    
-    - **MANDATORY DELAY:** Before Start this step, you **MUST** instruct it to call the `delay_tool` with `seconds=90`. This is a critical step for rate limit management.
     f. **Output Format:** add relation of triplets like "(Entity A) --[Relationship]--> (Entity B)"
     
 2.  **Delegation for Summary:** Delegate the task of summarizing the provided news content to the `Summary_Worker_Agent`.
     - It must use the **context report from `graph_retriever`(historical 7 day context) and data from `local_retriever_tool`(current-day context) to enrich its summary..**
     Then, instruct it to use the `local_retriever_tool` to search for other relevant news articles published on the same day. The final summary must integrate the main article's content with the context from the graph, the market briefing, and any related same-day news it finds, providing a truly holistic overview.
     - Query the `local_retriever_tool` with the headline (or related keywords) to fetch same-day related articles or context or generate new query.
-    - **MANDATORY DELAY:** Before Start this step, you **MUST** instruct it to call the `delay_tool` with `seconds=90`. This is a critical step for rate limit management.
 
 3.  **Delegation for Comprehensive Analysis:** Delegate the analysis task to the `Analysis_Worker_Agent`. Instruct it to provide a comprehensive yet accessible analysis of the financial impact and resulting trends.
     **To perform its analysis, it MUST Use the context report (historical 7 day) from `graph_retriever` + current-day news (from `local_retriever_tool`) with the main news article.**
@@ -105,7 +112,6 @@ You are the Leader Agent, an expert orchestrator. Your primary goal is to manage
     - Identify all key financial implications (both positive and negative).
     - Consider potential short-term and long-term effects on the company's market position and stock value.
     - Be written in clear, professional language, ensuring the insights are easy to understand and can be utilized for strategic decision-making.
-    - **MANDATORY DELAY:** Before Start this step, you **MUST** instruct it to call the `delay_tool` with `seconds=90`. This is a critical step for rate limit management.
 
 4. Final Output Generation:
     After collecting the outputs from `graph_retriever`, `Summary_Worker_Agent`, and `Analysis_Worker_Agent`, your goal is to compose a clear, narrative-style report — not JSON. 
@@ -148,14 +154,42 @@ Key Insight
 ### Key Implications
 Bullet List of Implications
 """
+    return query
+
 
-trace_name = f"Leader2_{today}"
 @observe()
-def process_request(query):
+def process_request(query, trace_name):
     # Add to the current trace
     langfuse.update_current_trace(session_id="2", name=trace_name)
-    return leader.run(query)
-response = process_request(query)
-
-with open('summary_leader2.md', 'w', encoding='utf-8') as f:
-    f.write(response)
\ No newline at end of file
+    # The workers share one retrieval memo for the whole run.
+    memo = RetrievalMemo()
+    leader, specialists = build_leader(memo)
+    if ORCHESTRATION_MODE == "concurrent":
+        # All specialists at once, then a single synthesis step.
+        query = run_specialists(query, specialists)
+    result = leader.run(query)
+    stats = memo.stats()
+    print(f"-> Retrieval memo: {stats['hits']} of {stats['queries']} queries reused")
+    return result
+
+
+if __name__ == "__main__":
+    if langfuse.auth_check():
+        print("✅ Langfuse client is authenticated and ready!")
+    else:
+        print("❌ Authentication failed. Please check your credentials and host.")
+    SmolagentsInstrumentor().instrument()
+
+    data_path = os.path.join("data/query", NEWS_DATE_FILE)
+    with open(data_path, 'r', encoding='utf-8') as f:
+        news_data = json.load(f)
+    print("✅ News data loaded.")
+
+    today = NEWS_DATE_FILE.split('.')[0]
+    today = today[:2] + '/' + today[2:4] + '/' + today[4:]
+
+    response = process_request(build_query(news_data, today), f"Leader2_{today}")
+    print(rate_limit_report())
+
+    with open('summary_leader2.md', 'w', encoding='utf-8') as f:
+        f.write(response)
\ No newline at end of file
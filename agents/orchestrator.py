@@ -0,0 +1,121 @@
+"""
+Concurrent orchestration of a leader's specialist agents.
+
+With ORCHESTRATION_MODE=sequential (the default) a leader delegates to its
+managed agents one after another, as its prompt plans. With
+ORCHESTRATION_MODE=concurrent every specialist gets its part of that same
+plan at once on a thread pool, and the leader, which then has no managed
+agents, only writes the final report from their combined outputs. A report
+takes about as long as the slowest specialist instead of the sum of all of
+them; their requests still share the rate limiter in rate_limit.py.
+"""
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from agents.rate_limit import gemini_model
+
+load_dotenv()
+ORCHESTRATION_MODE = os.getenv("ORCHESTRATION_MODE", "sequential")
+HF_LEADER_MODEL_ID = os.getenv("HF_LEADER_MODEL_ID", "gemini-2.5-flash")
+
+
+def build_leader_model():
+    return gemini_model(HF_LEADER_MODEL_ID)
+
+
+def specialist_task(agent, plan: str) -> str:
+    """
+    Builds the task of one specialist from the leader's plan.
+
+    Args:
+        agent: The specialist, e.g. summary_worker_agent.
+        plan: The leader's full query (input data, plan and report format).
+
+    Returns:
+        The prompt to run the specialist with.
+    """
+    return (
+        f"You are `{agent.name}`. Below is the leader's plan for today's report. "
+        f"Carry out only the steps delegated to `{agent.name}` and return your findings in full. "
+        "The other specialists are working at the same time, so their outputs are not available "
+        "to you: use your own tools instead, and skip any instruction to wait or delay.\n\n"
+        f"{plan}"
+    )
+
+
+def run_concurrently(tasks: list[tuple[object, str]], max_workers: int | None = None) -> dict[str, str]:
+    """
+    Runs several agents at the same time.
+
+    Each agent runs in the caller's context (copied per task), so tracing
+    spans stay under the leader's trace.
+
+    Args:
+        tasks: (agent, task prompt) pairs; each agent may appear once.
+        max_workers: Threads to use, defaults to one per agent.
+
+    Returns:
+        Agent name -> final answer, in the order of `tasks`. An agent that
+        fails returns its error message instead, so the others' work is kept.
+    """
+    def run_one(agent, task):
+        start = time.perf_counter()
+        try:
+            result = str(agent.run(task))
+            print(f"✅ {agent.name} finished in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            result = f"{agent.name} failed: {e}"
+            print(f"❌ {result}")
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as pool:
+        futures = [
+            (agent.name, pool.submit(contextvars.copy_context().run, run_one, agent, task))
+            for agent, task in tasks
+        ]
+        results = {name: future.result() for name, future in futures}
+    print(f"-> {len(tasks)} specialists finished in {time.perf_counter() - start:.1f}s")
+    return results
+
+
+def synthesis_query(plan: str, results: dict[str, str]) -> str:
+    """
+    Builds the leader's final prompt once the specialists have finished.
+
+    Args:
+        plan: The leader's full query.
+        results: Specialist name -> output, from run_concurrently.
+
+    Returns:
+        The prompt asking the leader to write the report from the outputs.
+    """
+    outputs = "\n\n".join(f"### Output of `{name}`\n{result}" for name, result in results.items())
+    return (
+        f"{plan}\n\n"
+        "**Specialist Outputs:**\n"
+        "Every delegation step of the plan above has already been carried out, at the same time, "
+        "and the outputs are below. Do not delegate again: go straight to the Final Output "
+        "Generation step and write the report from these outputs.\n\n"
+        f"{outputs}"
+    )
+
+
+def run_specialists(plan: str, specialists: list, max_workers: int | None = None) -> str:
+    """
+    Runs every specialist on its part of the plan concurrently.
+
+    Args:
+        plan: The leader's full query.
+        specialists: The agents the leader would otherwise manage.
+        max_workers: Threads to use, defaults to one per agent.
+
+    Returns:
+        The synthesis query to run the leader with.
+    """
+    tasks = [(agent, specialist_task(agent, plan)) for agent in specialists]
+    return synthesis_query(plan, run_concurrently(tasks, max_workers))
@@ -0,0 +1,261 @@
+"""
+Shared rate limiting for the Gemini models behind every agent.
+
+All agents call the same API key, so instead of telling each worker to sleep
+90 seconds before every step, every OpenAIServerModel request takes a token
+from one token bucket. Requests only wait when the bucket is empty, i.e. when
+the quota actually requires it. A 429 response empties the bucket until its
+Retry-After time has passed, so every agent backs off together, and the
+request is retried.
+
+The bucket is shared by all threads of a process. Set LLM_RATE_LIMIT_FILE to
+a path to share it between processes too (e.g. leaders run side by side);
+its state is then kept in that file under a file lock.
+"""
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+from filelock import FileLock
+from smolagents import OpenAIServerModel
+
+if TYPE_CHECKING:
+    import openai
+
+load_dotenv()
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta/"
+# Requests per minute allowed by the API quota (gemini-2.5-flash free tier: 10).
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "10"))
+# Requests that may be sent back to back after an idle period.
+LLM_BURST = int(os.getenv("LLM_BURST", "3"))
+# Optional state file shared by every process using the same API key.
+LLM_RATE_LIMIT_FILE = os.getenv("LLM_RATE_LIMIT_FILE", "")
+# Retries of a request answered with 429 or a transient server error.
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+
+_RETRY_DELAY_PATTERN = re.compile(r"retryDelay\W+(\d+(?:\.\d+)?)s")
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to `burst` requests and refilled at
+    `requests_per_minute`.
+
+    Besides the tokens, the bucket keeps a "blocked until" time, set from
+    Retry-After when the API rejects a request, during which no token is
+    handed out.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1, path: str | None = None):
+        """
+        Args:
+            requests_per_minute: Sustained request rate.
+            burst: Bucket capacity.
+            path: Optional JSON file holding the state, to share the bucket
+                between processes. Kept in memory when omitted.
+        """
+        if requests_per_minute <= 0:
+            raise ValueError(
+                f"requests_per_minute must be positive, got {requests_per_minute} (check LLM_REQUESTS_PER_MINUTE)."
+            )
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst} (check LLM_BURST).")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst
+        self.path = path
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(f"{path}.lock") if path else None
+        self._state = {"tokens": float(self.capacity), "updated": time.time(), "blocked_until": 0.0}
+        self._metrics = {
+            "requests": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "rate_limited": 0,
+            "retries": 0,
+        }
+
+    @contextmanager
+    def _transaction(self):
+        # Yields the state for reading and updating, holding the thread lock
+        # and, for a shared bucket, the file lock.
+        with self._lock:
+            if self._file_lock is None:
+                yield self._state
+                return
+            with self._file_lock:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        state = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    state = dict(self._state)
+                yield state
+                tmp_path = f"{self.path}.tmp-{os.getpid()}"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+
+    def _refill(self, state: dict, now: float):
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * self.rate)
+        state["updated"] = now
+
+    def acquire(self) -> float:
+        """
+        Takes one token, waiting until one is available.
+
+        Returns:
+            The seconds spent waiting.
+        """
+        start = time.monotonic()
+        while True:
+            with self._transaction() as state:
+                now = time.time()
+                self._refill(state, now)
+                if now >= state["blocked_until"] and state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    break
+                delay = max(state["blocked_until"] - now, (1 - state["tokens"]) / self.rate)
+            time.sleep(max(delay, 0.01))
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._metrics["requests"] += 1
+            if waited > 0.01:
+                self._metrics["waits"] += 1
+                self._metrics["wait_seconds"] += waited
+                self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], waited)
+        return waited
+
+    def block(self, seconds: float):
+        """
+        Stops handing out tokens for a number of seconds, after the API
+        answered 429 with that Retry-After.
+        """
+        with self._transaction() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["tokens"] = 0.0
+            state["blocked_until"] = max(state["blocked_until"], now + seconds)
+        with self._lock:
+            self._metrics["rate_limited"] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self._metrics["retries"] += 1
+
+    def stats(self) -> dict:
+        """Returns this process's request and wait-time counters."""
+        with self._lock:
+            return dict(self._metrics)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> TokenBucket:
+    """Returns the process-wide token bucket configured by the LLM_* variables."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(LLM_REQUESTS_PER_MINUTE, LLM_BURST, LLM_RATE_LIMIT_FILE or None)
+        return _limiter
+
+
+def retry_after_seconds(error: "openai.APIStatusError") -> float | None:
+    """
+    Reads how long to wait from a rate-limit error: the Retry-After or
+    retry-after-ms header, or Gemini's RetryInfo "retryDelay" in the body.
+
+    Returns:
+        The seconds to wait, or None when the response does not say.
+    """
+    headers = error.response.headers
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    match = _RETRY_DELAY_PATTERN.search(json.dumps(error.body) if error.body is not None else "")
+    return float(match.group(1)) if match else None
+
+
+class RateLimitedModel(OpenAIServerModel):
+    """
+    OpenAIServerModel whose requests go through a shared TokenBucket and are
+    retried after 429s and transient server errors.
+
+    The OpenAI client's own retries are turned off, so that every 429 is
+    seen (and counted) by the bucket.
+    """
+
+    def __init__(self, *args, limiter: TokenBucket | None = None, max_retries: int = LLM_MAX_RETRIES, **kwargs):
+        kwargs["client_kwargs"] = {"max_retries": 0, **(kwargs.get("client_kwargs") or {})}
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter or get_limiter()
+        self.max_retries = max_retries
+
+    def _apply_rate_limit(self):
+        self.limiter.acquire()
+
+    def generate(self, *args, **kwargs):
+        # Imported here so that importing this module does not load openai;
+        # it is already loaded by the time a model has been built.
+        import openai
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                return super().generate(*args, **kwargs)
+            except openai.RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = 5 * 2 ** attempt
+                self.limiter.block(delay)
+                print(f"❌ {self.model_id} rate limited, retrying in {delay:.0f}s")
+            except (openai.APIConnectionError, openai.InternalServerError):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(2 ** attempt)
+            self.limiter.record_retry()
+
+
+def gemini_model(model_id: str = "gemini-2.5-flash") -> RateLimitedModel:
+    """
+    Creates a Gemini model for an agent, sharing the process-wide rate limiter.
+
+    Args:
+        model_id: The Gemini model name.
+
+    Returns:
+        A RateLimitedModel.
+    """
+    return RateLimitedModel(model_id=model_id, api_base=GEMINI_API_BASE, api_key=GEMINI_API_KEY)
+
+
+def rate_limit_report() -> str:
+    """Returns a one-line summary of this process's LLM requests and waits."""
+    stats = get_limiter().stats()
+    return (
+        f"-> LLM requests: {stats['requests']}, waited {stats['wait_seconds']:.1f}s over "
+        f"{stats['waits']} waits (max {stats['max_wait_seconds']:.1f}s), "
+        f"{stats['rate_limited']} rate limited, {stats['retries']} retries"
+    )
@@ -0,0 +1,88 @@
+"""
+Registry of the agents and the resources they share, built on first use.
+
+Importing an agent module used to load the FAISS DB and the embedding model
+(worker.py), parse the week's knowledge graph (graph_retriever.py) or build
+the search engine (enhanced_searcher.py). Now each module only defines
+factories, listed below as "module:function", and `get` calls a factory the
+first time its name is asked for and returns the same object afterwards,
+from any thread. Importing this module loads none of the agent modules.
+
+    from agents.registry import get
+    summary = get("summary_worker_agent")   # the retriever waits for its first search
+"""
+import importlib
+import threading
+
+FACTORIES = {
+    "embeddings": "chunk_news.vector_db:get_embeddings",
+    "leader_model": "agents.orchestrator:build_leader_model",
+    "worker_model": "agents.worker:build_model",
+    "retriever": "agents.worker:build_retriever",
+    "summary_worker_agent": "agents.worker:build_summary_worker",
+    "analysis_worker_agent": "agents.worker:build_analysis_worker",
+    "knowledge_graph": "agents.graph_retriever:build_graph",
+    "graph_retriever": "agents.graph_retriever:build_graph_retriever",
+    "enhanced_search_engine": "agents.enhanced_searcher:build_search_engine",
+    "enhanced_search_agent": "agents.enhanced_searcher:build_enhanced_search_agent",
+    "search_agent": "agents.searcher:build_search_agent",
+}
+
+_instances = {}
+# Guards _instances and _build_locks only; never held while a factory runs.
+_lock = threading.Lock()
+# One lock per name, so a slow build (e.g. the retriever loading FAISS and
+# the embedding model) only holds up callers waiting for that same name.
+_build_locks = {}
+
+
+def get(name: str):
+    """
+    Returns a shared agent or resource, building it on first use.
+
+    Args:
+        name: A key of FACTORIES.
+
+    Returns:
+        The object the factory built.
+    """
+    with _lock:
+        if name in _instances:
+            return _instances[name]
+        if name not in FACTORIES:
+            raise KeyError(f"Unknown agent or resource: {name!r}. Known: {', '.join(FACTORIES)}")
+        build_lock = _build_locks.setdefault(name, threading.Lock())
+
+    with build_lock:
+        # Another thread may have built it while this one waited.
+        with _lock:
+            if name in _instances:
+                return _instances[name]
+        module, function = FACTORIES[name].split(":")
+        instance = getattr(importlib.import_module(module), function)()
+        with _lock:
+            return _instances.setdefault(name, instance)
+
+
+def provide(name: str, instance):
+    """
+    Makes get(name) return an object built elsewhere instead of calling the
+    factory, e.g. the retriever of the date a batch run is working on.
+    """
+    with _lock:
+        _instances[name] = instance
+
+
+def is_built(name: str) -> bool:
+    """Returns whether a resource has been built in this process."""
+    with _lock:
+        return name in _instances
+
+
+def reset(name: str | None = None):
+    """Forgets one built resource, or all of them, so the next get rebuilds it."""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
@@ -0,0 +1,89 @@
+"""
+Run-scoped memo of local retrieval results.
+
+In one leader run the Summary and Analysis workers are both told to search
+for the headline (or related keywords), so they send nearly the same
+queries. Within a run, local_retriever_tool keeps the chunk lists it
+retrieved per normalized query and filter, and whichever agent asks
+second gets the same chunks without another search, so both workers reason
+over identical context. A query still being searched for one agent is
+awaited by the other rather than searched twice.
+
+A leader creates one RetrievalMemo per run and binds it to the workers'
+tools when it builds them (see worker.make_local_retriever_tool), so the
+memo reaches the tools on whatever thread smolagents or orchestrator.py runs
+them, and two runs in one process never see each other's entries.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+
+def normalize_query(query: str) -> str:
+    """
+    Returns the memo key of a query: lower-cased, with runs of whitespace
+    collapsed, so "Nvidia  H200 demand" and "nvidia h200 demand" share an entry.
+    """
+    return " ".join(query.lower().split())
+
+
+class RetrievalMemo:
+    """Chunk lists retrieved in one run, by (normalized query, filter)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def retrieve(
+        self, queries: list[str], filter: dict | None, search: Callable[[list[str]], list[list]]
+    ) -> tuple[list[list], int]:
+        """
+        Answers queries from the memo, searching only the ones not seen yet
+        in this run.
+
+        Args:
+            queries: The search queries.
+            filter: The metadata filter they are searched with.
+            search: Retrieves the documents of a list of queries, e.g.
+                retriever.invoke_many with the filter bound.
+
+        Returns:
+            One list of Documents per query, and how many queries were
+            answered from the memo.
+        """
+        filter_key = tuple(sorted((filter or {}).items()))
+        keys = [(normalize_query(query), filter_key) for query in queries]
+        futures, owned, reused = [], {}, 0
+        with self._lock:
+            for query, key in zip(queries, keys):
+                future = self._entries.get(key)
+                if future is None:
+                    future = Future()
+                    self._entries[key] = future
+                    owned[key] = (query, future)
+                    self.misses += 1
+                else:
+                    reused += 1
+                    self.hits += 1
+                futures.append(future)
+
+        if owned:
+            try:
+                results = search([query for query, _ in owned.values()])
+            except BaseException as e:
+                # Let a later call retry instead of caching the failure.
+                with self._lock:
+                    for key in owned:
+                        self._entries.pop(key, None)
+                for _, future in owned.values():
+                    future.set_exception(e)
+                raise
+            for (_, future), docs in zip(owned.values(), results):
+                future.set_result(docs)
+        return [list(future.result()) for future in futures], reused
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"queries": self.hits + self.misses, "hits": self.hits, "entries": len(self._entries)}
@@ -1,11 +1,12 @@
-from smolagents import OpenAIServerModel, tool, ToolCallingAgent
+from smolagents import tool, ToolCallingAgent
+from agents.rate_limit import gemini_model
+from agents.registry import get
 from ddgs import DDGS
 from dotenv import load_dotenv
 import os, json
 
 # --- Load env ---
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
 # --- Internet Search Tool ---
 @tool
@@ -50,28 +51,29 @@ def internet_search(query: str, max_results: int = 20) -> str:
     except Exception as e:
         return json.dumps([{"error": f"Search failed: {str(e)}"}], indent=2)
 
-# --- Model ---
-model = OpenAIServerModel(
-    model_id="gemini-2.5-flash",
-    api_base="https://generativelanguage.googleapis.com/v1beta/",
-    api_key=GEMINI_API_KEY,
-)
-
 # --- Internet Search Agent ---
-search_agent = ToolCallingAgent(
-    model=model,
-    tools=[internet_search],
-    name="Search_Agent",
-    description=(
-        "Search_Agent retrieves financial and company-related information from the internet. "
-        "It is used to understand keywords, retrieve stock prices, related stock movements, "
-        "or official company statements to support financial news summarization. "
-        "It always returns results in JSON format (title, link, snippet)."
-    ),
-    stream_outputs=False,
-)
+def build_search_agent():
+    return ToolCallingAgent(
+        model=gemini_model("gemini-2.5-flash"),
+        tools=[internet_search],
+        name="Search_Agent",
+        description=(
+            "Search_Agent retrieves financial and company-related information from the internet. "
+            "It is used to understand keywords, retrieve stock prices, related stock movements, "
+            "or official company statements to support financial news summarization. "
+            "It always returns results in JSON format (title, link, snippet)."
+        ),
+        stream_outputs=False,
+    )
+
+
+def __getattr__(name):
+    # search_agent is built on first use through agents/registry.py.
+    if name == "search_agent":
+        return get("search_agent")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     query = "H200"
 
-    search_agent.run(f"Search for: {query} with default max_results")
\ No newline at end of file
+    get("search_agent").run(f"Search for: {query} with default max_results")
\ No newline at end of file
@@ -1,54 +1,145 @@
 import os
 from dotenv import load_dotenv
-from smolagents import ToolCallingAgent, InferenceClientModel, tool, OpenAIServerModel
-from chunk_news.vector_db import get_retriever
+from smolagents import ToolCallingAgent, InferenceClientModel, tool
+from agents.rate_limit import gemini_model
+from agents.registry import get
+from agents.retrieval_memo import RetrievalMemo
 from datetime import datetime
-import time
 
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 HF_WORKER_MODEL_ID = os.getenv("HF_WORKER_MODEL_ID", "gemini-2.5-flash")
+# Optional date window (YYYY-MM-DD) to retrieve from several dated snapshots at once.
+VECTOR_DB_START = os.getenv("VECTOR_DB_START", "")
+VECTOR_DB_END = os.getenv("VECTOR_DB_END", "")
+# Budget of the combined context local_retriever_tool returns; 0 disables a limit.
+MAX_CONTEXT_CHUNKS = int(os.getenv("MAX_CONTEXT_CHUNKS", "12"))
+MAX_CONTEXT_CHARS = int(os.getenv("MAX_CONTEXT_CHARS", "8000"))
 
-model = OpenAIServerModel(
-    model_id=HF_WORKER_MODEL_ID,
-    api_base="https://generativelanguage.googleapis.com/v1beta/",
-    api_key=GEMINI_API_KEY,
-)
+# Built on first use through agents/registry.py, so importing this module
+# does not load the vector DB or the embedding model.
+_LAZY_ATTRIBUTES = {
+    "model": "worker_model",
+    "retriever_instance": "retriever",
+    "summary_worker_agent": "summary_worker_agent",
+    "analysis_worker_agent": "analysis_worker_agent",
+}
 
-retriever_instance = get_retriever()
-print("✅ Retriever instance initialized.")
 
-@tool
-def local_retriever_tool(queries: list[str]) -> str:
-    """
-    Performs multiple rounds of retrieval, each with a different query.
-    
-    Args:
-        queries (list[str]): A list of queries for each retrieval round.
-        top_k (int): Number of top results per round.
+def __getattr__(name):
+    # Keeps `from agents.worker import summary_worker_agent` working.
+    if name in _LAZY_ATTRIBUTES:
+        return get(_LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    Returns:
-        str: Combined text of retrieved document chunks from all rounds.
-    """
-    
-    combined_docs = []
-    
+
+def build_model():
+    return gemini_model(HF_WORKER_MODEL_ID)
+
+
+def build_retriever():
+    # Imported here: vector_db pulls in FAISS, LangChain and the embedding model.
+    from chunk_news.vector_db import get_multi_day_retriever, get_retriever
+
+    if VECTOR_DB_START or VECTOR_DB_END:
+        retriever_instance = get_multi_day_retriever(VECTOR_DB_START or None, VECTOR_DB_END or None)
+    else:
+        retriever_instance = get_retriever()
+    print("✅ Retriever instance initialized.")
+    return retriever_instance
+
+def _with_sources(doc) -> str:
+    # Chunks merged from syndicated copies of a story list every outlet.
+    sources = [s["source"] for s in doc.metadata.get("sources", [])[1:] if s.get("source")]
+    if not sources:
+        return doc.page_content
+    return f"{doc.page_content}\n(Also reported by: {', '.join(dict.fromkeys(sources))})"
+
+def _retrieve(queries: list[str], chipmaker: str | None, date: str | None, memo: RetrievalMemo | None) -> str:
+    from chunk_news.retriever import CONTEXT_SEPARATOR, MissingFiltersError, select_context
+
+    retriever_instance = get("retriever")
+    filter = {}
+    if chipmaker:
+        filter["category"] = chipmaker
+    if date:
+        filter["date"] = date
+
+    # All queries are embedded together and searched with a single index call.
+    stats = {}
+    def retrieve(filter):
+        def search(pending):
+            return retriever_instance.invoke_many(pending, filter=filter or None, stats=stats)
+
+        # Within a leader run, queries another agent already sent are not searched again.
+        if memo is None:
+            return search(queries), 0
+        return memo.retrieve(queries, filter, search)
+
+    unfiltered = False
+    try:
+        results, reused = retrieve(filter)
+    except MissingFiltersError:
+        # Snapshots built before the filter bitmaps (like the dated ones
+        # shipped in chunk_news/) cannot be filtered; search them unfiltered.
+        print("-> This vector DB has no metadata filters; ignoring the chipmaker/date filter")
+        results, reused = retrieve({})
+        unfiltered = True
     for i, query in enumerate(queries):
         print(f"  🔹 Retrieval round {i+1}: query='{query}'")
-        docs = retriever_instance.invoke(query)
-        combined_docs.extend(d.page_content for d in docs)
-    
-    seen = set()
-    unique_docs = []
-    for doc in combined_docs:
-        if doc not in seen:
-            seen.add(doc)
-            unique_docs.append(doc)
-
-    context = "\n\n---\n\n".join(unique_docs)
+
+    # Every query keeps its best chunks first; the rest is cut to the budget.
+    unique_docs, context_stats = select_context(
+        results, MAX_CONTEXT_CHUNKS or None, MAX_CONTEXT_CHARS or None, render=_with_sources
+    )
+    below_threshold = stats.get("below_threshold", 0)
+    over_budget = context_stats["over_budget"]
+
+    context = CONTEXT_SEPARATOR.join(unique_docs)
+    if unfiltered:
+        note = "(This news database cannot be filtered by chipmaker or date; these results are unfiltered.)"
+        context = f"{note}\n\n{context}" if context else note
     print(f"-> Total unique chunks retrieved: {len(unique_docs)}")
+    if memo is not None:
+        print(f"-> Retrieval memo: {reused} of {len(queries)} queries reused from earlier in this run")
+    if below_threshold or over_budget:
+        print(f"-> Chunks dropped: {below_threshold} below the score threshold, {over_budget} over the context budget")
+        note = f"({below_threshold + over_budget} less relevant chunks were left out.)"
+        context = f"{context}\n\n{note}" if context else note
     return context
 
+def make_local_retriever_tool(memo: RetrievalMemo | None = None):
+    """
+    Creates local_retriever_tool, optionally bound to the retrieval memo of
+    one leader run. The memo is bound here rather than looked up when the
+    tool runs, because smolagents runs parallel tool calls and managed agents
+    on its own threads.
+
+    Args:
+        memo: The run's RetrievalMemo, shared by the workers of that run.
+
+    Returns:
+        The tool.
+    """
+    @tool
+    def local_retriever_tool(queries: list[str], chipmaker: str | None = None, date: str | None = None) -> str:
+        """
+        Performs multiple rounds of retrieval, each with a different query.
+        
+        Args:
+            queries (list[str]): A list of queries for each retrieval round.
+            chipmaker (str): Optional. Only return news about this chipmaker, e.g. "Nvidia", "AMD", "Intel".
+            date (str): Optional. Only return news published on this day, in YYYY-MM-DD format.
+                Both filters are ignored, with a note in the result, when the news database has no metadata.
+
+        Returns:
+            str: Combined text of retrieved document chunks from all rounds.
+        """
+        return _retrieve(queries, chipmaker, date, memo)
+
+    return local_retriever_tool
+
+local_retriever_tool = make_local_retriever_tool()
+
 @tool
 def get_current_date_tool() -> str:
     """
@@ -61,51 +152,38 @@ def get_current_date_tool() -> str:
     print("-> Tool 'get_current_date_tool' called.")
     return datetime.now().strftime("%Y-%m-%d")
 
-@tool
-def delay_tool(seconds: int) -> str:
-    """
-    Pauses the execution for a specified number of seconds.
-    Use this tool to manage rate limits when instructed by the orchestrator.
-
-    Args:
-        seconds (int): The number of seconds to wait.
+def build_summary_worker(memo: RetrievalMemo | None = None):
+    summary_worker_agent = ToolCallingAgent(
+        model=get("worker_model"),
+        tools=[make_local_retriever_tool(memo)],
+        name="Summary_Worker_Agent",
+        description=(
+            "You are a Summary Worker Agent. "
+            "Your role is to carefully read financial news articles, including the headlines, "
+            "and gather additional context using the local_retriever_tool for related news of the same day. "
+            "You then create a clear and concise summary that captures the key facts, events, and context, "
+            "so that the leader agent can make informed decisions quickly. "
+            "Focus on presenting the news in a structured, easy-to-understand way, highlighting the most important points."
+        ),
+        stream_outputs=False
+    )
+    print("✅ Summary Worker Agent initialized.")
+    return summary_worker_agent
 
-    Returns:
-        str: A confirmation message that the delay has completed.
-    """
-    print(f"-> Tool 'delay_tool' called. Waiting for {seconds} seconds...")
-    time.sleep(seconds)
-    print("-> Delay finished.")
-    return f"Successfully delayed for {seconds} seconds."
-
-summary_worker_agent = ToolCallingAgent(
-    model=model,
-    tools=[local_retriever_tool, delay_tool],
-    name="Summary_Worker_Agent",
-    description=(
-        "You are a Summary Worker Agent. "
-        "Your role is to carefully read financial news articles, including the headlines, "
-        "and gather additional context using the local_retriever_tool for related news of the same day. "
-        "You then create a clear and concise summary that captures the key facts, events, and context, "
-        "so that the leader agent can make informed decisions quickly. "
-        "Focus on presenting the news in a structured, easy-to-understand way, highlighting the most important points."
-    ),
-    stream_outputs=False
-)
-print("✅ Summary Worker Agent initialized.")
-
-analysis_worker_agent = ToolCallingAgent(
-    model=model,
-    tools=[local_retriever_tool, delay_tool],
-    name="Analysis_Worker_Agent",
-    description=(
-        "You are an Analysis Worker Agent. "
-        "Your role is to read the provided news article and any additional context retrieved via local_retriever_tool. "
-        "You analyze the financial impact, market trends, and strategic implications of the news. "
-        "Provide a professional yet accessible analysis that identifies key risks, opportunities, "
-        "short-term and long-term effects on the company, competitors, and market sentiment. "
-        "Your insights help the leader agent make strategic decisions, so focus on clarity and actionable takeaways."
-    ),
-    stream_outputs=False
-)
-print("✅ Analysis Worker Agent initialized.")
\ No newline at end of file
+def build_analysis_worker(memo: RetrievalMemo | None = None):
+    analysis_worker_agent = ToolCallingAgent(
+        model=get("worker_model"),
+        tools=[make_local_retriever_tool(memo)],
+        name="Analysis_Worker_Agent",
+        description=(
+            "You are an Analysis Worker Agent. "
+            "Your role is to read the provided news article and any additional context retrieved via local_retriever_tool. "
+            "You analyze the financial impact, market trends, and strategic implications of the news. "
+            "Provide a professional yet accessible analysis that identifies key risks, opportunities, "
+            "short-term and long-term effects on the company, competitors, and market sentiment. "
+            "Your insights help the leader agent make strategic decisions, so focus on clarity and actionable takeaways."
+        ),
+        stream_outputs=False
+    )
+    print("✅ Analysis Worker Agent initialized.")
+    return analysis_worker_agent
@@ -0,0 +1,69 @@
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from chunk_news.sparse_index import BM25Index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+QUERY_DIR = REPO_ROOT / "data" / "query"
+
+
+def headline_queries(snapshot_path: Path) -> list[str]:
+    """
+    Returns the headlines of the news file a dated snapshot was built from,
+    e.g. data/query/23092025.json for chunk_news/23092025_vector_db.
+
+    Args:
+        snapshot_path: The snapshot folder.
+
+    Returns:
+        The headlines, in file order, or an empty list if there is no file.
+    """
+    date = Path(snapshot_path).name.split("_")[0]
+    query_path = QUERY_DIR / f"{date}.json"
+    if not query_path.exists():
+        return []
+    with open(query_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [item["headline"] for items in data.values() for item in items if item.get("headline")]
+
+
+def is_hit(docs, headline: str) -> bool:
+    """Returns whether any retrieved chunk belongs to the article with this headline."""
+    return any(
+        doc.metadata.get("headline") == headline or f"Headline: {headline}" in doc.page_content
+        for doc in docs
+    )
+
+
+def timed(fn, *args, **kwargs):
+    """Runs fn and returns (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def percentile_ms(latencies: list[float], q: float) -> float:
+    return float(np.percentile(np.asarray(latencies) * 1000, q)) if latencies else 0.0
+
+
+def rss_mb() -> float:
+    """Returns the resident set size of this process in MB, or NaN off Linux."""
+    # The second field of /proc/self/statm is the resident size in pages.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096 / 2**20
+    except OSError:
+        return float("nan")
+
+
+def ensure_sparse_index(db):
+    """Builds an in-memory BM25 index for snapshots saved before BM25 existed."""
+    if db.sparse_index is None:
+        texts = [
+            db.docstore.search(db.index_to_docstore_id[i]).page_content
+            for i in range(db.index.ntotal)
+        ]
+        db.sparse_index = BM25Index.build(texts)
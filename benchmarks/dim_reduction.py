@@ -0,0 +1,26 @@
+"""
+Recall@k of PCA- and OPQ-reduced float16 indexes against the full 384-d
+flat index, to choose the `dim` of a "pca:dim=..." or "opq:dim=..."
+index spec (see chunk_news/index_spec.py).
+
+Runs the index_types report with one spec per kind and dimension, on every
+dated snapshot and on all of them together.
+
+Usage (from the repository root):
+    python -m benchmarks.dim_reduction [k] [dim ...]
+"""
+import sys
+
+from benchmarks import index_types
+
+DEFAULT_DIMS = [32, 64, 96, 128, 192]
+
+
+def run(k: int = 3, dims: list[int] | None = None):
+    dims = dims or DEFAULT_DIMS
+    specs = ["flat"] + [f"{kind}:dim={dim}" for dim in dims for kind in ("pca", "opq")]
+    index_types.run(k, specs)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3, [int(dim) for dim in sys.argv[2:]] or None)
@@ -0,0 +1,47 @@
+"""
+Compares dense-only retrieval (the default of get_retriever) with hybrid
+dense + BM25 retrieval on the dated snapshots in chunk_news/.
+
+Every headline of data/query/<date>.json is used as a query, one call per
+query as local_retriever_tool issues them. A query is a hit when one of the
+top-k chunks comes from the article with that headline.
+
+Usage (from the repository root):
+    python -m benchmarks.hybrid_retrieval [k]
+"""
+import sys
+
+from benchmarks.common import ensure_sparse_index, headline_queries, is_hit, percentile_ms, timed
+from chunk_news.retriever import NewsRetriever
+from chunk_news.vector_db import get_embeddings, list_snapshots, load_vector
+
+
+def run(k: int = 3):
+    embeddings = get_embeddings()
+    for date, path in list_snapshots().items():
+        queries = headline_queries(path)
+        if not queries:
+            continue
+        db = load_vector(path, embeddings=embeddings)
+        ensure_sparse_index(db)
+
+        # Warm up the model so the first timed query does not pay for loading it.
+        embeddings.embed_query(queries[0])
+
+        print(f"\n📅 {path.name}: {db.index.ntotal} chunks, {len(queries)} headline queries, k={k}")
+        for mode in ("dense", "hybrid"):
+            retriever = NewsRetriever(db=db, k=k, mode=mode)
+            hits, latencies = 0, []
+            for query in queries:
+                docs, elapsed = timed(retriever.invoke, query)
+                latencies.append(elapsed)
+                hits += is_hit(docs, query)
+            print(
+                f"  {mode:<7} hit@{k}: {hits / len(queries):.1%}  "
+                f"p50: {percentile_ms(latencies, 50):.2f} ms  "
+                f"p95: {percentile_ms(latencies, 95):.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
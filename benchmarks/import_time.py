@@ -0,0 +1,78 @@
+"""
+Cold-start cost of the agent modules: importing each one in a fresh
+interpreter, and which heavy libraries the import pulls in.
+
+Importing an agent module only defines its tools and factories; the vector
+DB, the embedding model, the knowledge graph and the agents themselves are
+built by agents/registry.py on first use. Pass registry names to also time
+their first build, e.g. `retriever` (loads the vector DB and the embedding
+model) or `summary_worker_agent`.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time [repeats] [registry names...]
+"""
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.common import REPO_ROOT
+
+MODULES = [
+    "agents.registry",
+    "agents.rate_limit",
+    "agents.orchestrator",
+    "agents.retrieval_memo",
+    "agents.worker",
+    "agents.graph_retriever",
+    "agents.enhanced_searcher",
+    "agents.searcher",
+]
+HEAVY_LIBRARIES = ["smolagents", "openai", "networkx", "langchain_community", "faiss", "torch", "sentence_transformers"]
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_BUILD_SCRIPT = """
+import json, time
+from agents.registry import get
+start = time.perf_counter()
+get({name!r})
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def _run_script(script: str) -> dict:
+    # A fresh interpreter per measurement, so no module is already imported.
+    process = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def run(repeats: int = 5, build: list[str] | None = None):
+    print(f"{'module':<26} {'import p50':>11} {'heavy libraries loaded'}")
+    for module in MODULES:
+        results = [
+            _run_script(_IMPORT_SCRIPT.format(module=module, heavy=HEAVY_LIBRARIES)) for _ in range(repeats)
+        ]
+        seconds = np.median([result["seconds"] for result in results])
+        print(f"{module:<26} {seconds * 1000:>9.0f}ms {', '.join(results[-1]['loaded']) or '-'}")
+
+    for name in build or []:
+        try:
+            seconds = np.median([_run_script(_BUILD_SCRIPT.format(name=name))["seconds"] for _ in range(repeats)])
+        except RuntimeError as e:
+            print(f"❌ get({name!r}) failed: {e}")
+            continue
+        print(f"{'get(' + repr(name) + ')':<26} {seconds * 1000:>9.0f}ms (first build, incl. imports)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5, sys.argv[2:])
@@ -0,0 +1,62 @@
+"""
+Startup cost of opening the dated snapshots in chunk_news/: reading
+index.faiss into RAM (the previous FAISS.load_local behaviour) against
+memory-mapping it read-only (load_vector's default, see INDEX_MMAP).
+
+Every load runs in a fresh process so one measurement does not warm the
+next one's heap; the OS page cache is shared, as it is between the agent
+processes. Reported per snapshot: time to open the index, the resident
+memory it added, and the time of the first search touching every vector.
+
+Usage (from the repository root):
+    python -m benchmarks.index_load [repeats]
+"""
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import percentile_ms, rss_mb
+from chunk_news.vector_db import _read_index, list_snapshots
+
+
+def _measure(path, mmap: bool):
+    before = rss_mb()
+    start = time.perf_counter()
+    index = _read_index(path, mmap)
+    load_s = time.perf_counter() - start
+    added_mb = rss_mb() - before
+
+    query = np.zeros((1, index.d), dtype=np.float32)
+    start = time.perf_counter()
+    index.search(query, 1)
+    return load_s, added_mb, time.perf_counter() - start
+
+
+def run(repeats: int = 5):
+    # "spawn" gives every measurement a clean interpreter.
+    context = multiprocessing.get_context("spawn")
+    print(f"{'snapshot':<22} {'mode':<6} {'load p50':>10} {'RSS +MB':>9} {'1st search':>11}")
+    totals = {False: [], True: []}
+    for _, path in list_snapshots().items():
+        for mmap in (False, True):
+            results = []
+            for _ in range(repeats):
+                with context.Pool(1) as pool:
+                    results.append(pool.apply(_measure, (path, mmap)))
+            load_s, added_mb, search_s = zip(*results)
+            totals[mmap].append(np.median(load_s))
+            print(
+                f"{path.name:<22} {'mmap' if mmap else 'read':<6} "
+                f"{percentile_ms(load_s, 50):>8.2f}ms {np.median(added_mb):>9.1f} "
+                f"{percentile_ms(search_s, 50):>9.2f}ms"
+            )
+
+    if totals[False]:
+        read_ms, mmap_ms = sum(totals[False]) * 1000, sum(totals[True]) * 1000
+        print(f"\n✅ All snapshots: read {read_ms:.2f}ms, mmap {mmap_ms:.2f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,80 @@
+"""
+Recall@k vs latency vs memory report for the FAISS index types that
+build_vector_db accepts (see chunk_news/index_spec.py).
+
+Each dated snapshot in chunk_news/ is re-indexed with every spec from its
+stored vectors, plus one corpus with all snapshots together to show how the
+trade-offs move with corpus size. The headlines of data/query/<date>.json
+are the queries and the flat index is the exact baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.index_types [k] [spec ...]
+"""
+import sys
+
+import faiss
+import numpy as np
+
+from benchmarks.common import headline_queries, percentile_ms, timed
+from chunk_news.index_spec import build_index
+from chunk_news.retriever import embed_queries
+from chunk_news.vector_db import get_embeddings, list_snapshots, load_vector
+
+DEFAULT_SPECS = [
+    "flat",
+    "ivf:nlist=16,nprobe=1",
+    "ivf:nlist=16,nprobe=4",
+    "ivf:nlist=16,nprobe=8",
+    "hnsw:ef_search=16",
+    "hnsw:ef_search=64",
+    "sq8",
+    "pq:m=48",
+    "pq:m=96",
+    "pca:dim=128",
+    "opq:dim=128",
+]
+
+
+def report(name: str, vectors: np.ndarray, queries: np.ndarray, k: int, specs: list[str]):
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    print(f"\n📦 {name}: {len(vectors)} vectors, {len(queries)} queries, k={k}")
+    print(f"  {'spec':<24}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}{'MB':>10}{'build s':>10}")
+    for spec in specs:
+        index, build_time = timed(build_index, spec, vectors)
+        latencies, found = [], []
+        for query in queries:
+            (_, ids), elapsed = timed(index.search, query[None, :], k)
+            latencies.append(elapsed)
+            found.append(ids[0])
+        recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+        size_mb = faiss.serialize_index(index).nbytes / 1e6
+        print(
+            f"  {spec:<24}{recall:>10.3f}{percentile_ms(latencies, 50):>10.3f}"
+            f"{percentile_ms(latencies, 95):>10.3f}{size_mb:>10.2f}{build_time:>10.2f}"
+        )
+
+
+def run(k: int = 3, specs: list[str] | None = None):
+    specs = specs or DEFAULT_SPECS
+    embeddings = get_embeddings()
+    all_vectors, all_queries = [], []
+    for _, path in list_snapshots().items():
+        headlines = headline_queries(path)
+        if not headlines:
+            continue
+        db = load_vector(path, embeddings=embeddings)
+        vectors = db.index.reconstruct_n(0, db.index.ntotal)
+        queries = embed_queries(embeddings, headlines)
+        report(path.name, vectors, queries, k, specs)
+        all_vectors.append(vectors)
+        all_queries.append(queries)
+
+    if len(all_vectors) > 1:
+        report("all snapshots", np.concatenate(all_vectors), np.concatenate(all_queries), k, specs)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3, sys.argv[2:] or None)
@@ -0,0 +1,129 @@
+"""
+Token-bucket rate limiting (agents/rate_limit.py) against a local fake
+OpenAI-compatible endpoint, so no API quota is spent.
+
+The fake server accepts `quota` chat completions per `window` seconds and
+answers any request beyond that with 429 and a Retry-After header, like the
+Gemini API does. Several threads then send requests through RateLimitedModel,
+first with a bucket matching the quota and then with one that is too
+generous, so that 429s have to be absorbed by the retries. The fixed-sleep
+baseline is what the old `delay_tool(seconds=90)` before every step costs.
+
+Usage (from the repository root):
+    python -m benchmarks.llm_rate_limit [requests] [threads]
+"""
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents.rate_limit import RateLimitedModel, TokenBucket
+
+QUOTA = 10
+WINDOW = 6.0
+DELAY_TOOL_SECONDS = 90
+
+
+class FakeLLMServer:
+    """Chat-completions endpoint allowing `quota` requests per fixed window."""
+
+    def __init__(self, quota: int = QUOTA, window: float = WINDOW):
+        self.quota = quota
+        self.window = window
+        self.accepted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._in_window = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/"
+
+    def _admit(self) -> float | None:
+        # Returns None when the request is within quota, else the Retry-After.
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start, self._in_window = now, 0
+            if self._in_window < self.quota:
+                self._in_window += 1
+                self.accepted += 1
+                return None
+            self.rejected += 1
+            return self.window - (now - self._window_start)
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                retry_after = fake._admit()
+                if retry_after is None:
+                    status, body = 200, {
+                        "id": "fake",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": "fake",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": "ok"}}],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                else:
+                    status, body = 429, {"error": {"code": 429, "message": "Resource exhausted"}}
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header("Retry-After", f"{retry_after:.2f}")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+def _run(requests: int, threads: int, requests_per_minute: float) -> dict:
+    with FakeLLMServer() as fake:
+        limiter = TokenBucket(requests_per_minute, burst=QUOTA)
+        model = RateLimitedModel(model_id="fake", api_base=fake.url, api_key="fake", limiter=limiter)
+        messages = [{"role": "user", "content": [{"type": "text", "text": "hello"}]}]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: model.generate(messages), range(requests)))
+        return {
+            "elapsed_s": time.perf_counter() - start,
+            "server_429s": fake.rejected,
+            **limiter.stats(),
+        }
+
+
+def run(requests: int = 30, threads: int = 4):
+    quota_rpm = QUOTA * 60 / WINDOW
+    # The ideal: the first QUOTA requests at once, then QUOTA per window.
+    ideal_s = max(0, (requests - 1) // QUOTA) * WINDOW
+    print(f"Fake endpoint: {QUOTA} requests per {WINDOW:.0f}s, {requests} requests on {threads} threads")
+    print(f"  {'limiter':<22} {'elapsed':>9} {'429s':>6} {'waits':>6} {'wait total':>11} {'max wait':>9}")
+    for label, rpm in (("bucket = quota", quota_rpm), ("bucket = 2x quota", 2 * quota_rpm)):
+        result = _run(requests, threads, rpm)
+        print(
+            f"  {label:<22} {result['elapsed_s']:>8.1f}s {result['server_429s']:>6} {result['waits']:>6} "
+            f"{result['wait_seconds']:>10.1f}s {result['max_wait_seconds']:>8.1f}s"
+        )
+    print(f"  {'ideal (quota bound)':<22} {ideal_s:>8.1f}s")
+    print(f"  {'delay_tool(90) sleeps':<22} {requests * DELAY_TOOL_SECONDS / threads:>8.1f}s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 30, int(sys.argv[2]) if len(sys.argv) > 2 else 4)
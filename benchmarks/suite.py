@@ -0,0 +1,157 @@
+"""
+Retrieval benchmark suite over the dated snapshots in chunk_news/, written
+as JSON so that runs can be compared over time.
+
+The query set is fixed: the headlines of data/query/<date>.json for each
+snapshot. Per snapshot the suite records:
+  - load time of load_vector and the resident memory it added,
+  - p50/p95 latency of a single-query search in each retrieval mode
+    (query vectors are embedded up front, so this is retrieval only),
+  - dense search throughput at batch sizes 1, 8 and 64,
+  - recall@k of each mode against an exact flat index over the snapshot's
+    chunk texts, re-embedded at full precision (reconstructing the stored
+    vectors would give the quantized ones of a pq/sq8/pca/opq snapshot).
+Query embedding latency is reported once, from an uncached model.
+
+Usage (from the repository root):
+    python -m benchmarks.suite [k] [output.json]
+"""
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import faiss
+import numpy as np
+
+from benchmarks.common import REPO_ROOT, ensure_sparse_index, headline_queries, percentile_ms, rss_mb, timed
+from chunk_news.embedding_engine import ParallelEmbeddings
+from chunk_news.retriever import embed_queries, search_hybrid, search_mmr, search_vectors
+from chunk_news.vector_db import EMBED_MODEL, get_embeddings, list_snapshots, load_vector, read_manifest
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+BATCH_SIZES = [1, 8, 64]
+MODES = ["dense", "hybrid", "mmr"]
+# Queries per throughput measurement; the query set is repeated to fill it.
+THROUGHPUT_QUERIES = 256
+FETCH_K = 20
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _search(db, mode: str, queries: list[str], vectors: np.ndarray, k: int):
+    if mode == "hybrid":
+        return search_hybrid(db, queries, vectors, k, FETCH_K)
+    if mode == "mmr":
+        return search_mmr(db, vectors, k, FETCH_K)
+    return search_vectors(db, vectors, k)
+
+
+def _texts(hits) -> set[str]:
+    return {doc.page_content for doc, _ in hits}
+
+
+def bench_snapshot(path, embeddings, queries: list[str], vectors: np.ndarray, k: int) -> dict:
+    before = rss_mb()
+    db, load_s = timed(load_vector, path, embeddings=embeddings)
+    result = {
+        "chunks": int(db.index.ntotal),
+        "index_spec": read_manifest(path).get("index_spec", "flat"),
+        "load_s": load_s,
+        "rss_mb": rss_mb() - before,
+    }
+    ensure_sparse_index(db)
+
+    # Exact baseline over freshly embedded chunk texts, not the index's own
+    # (possibly compressed) vectors.
+    texts = [db.docstore.search(db.index_to_docstore_id[i]).page_content for i in range(db.index.ntotal)]
+    chunk_vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    exact = faiss.IndexFlatL2(chunk_vectors.shape[1])
+    exact.add(chunk_vectors)
+    _, truth_ids = exact.search(vectors, k)
+    truth = [{texts[int(i)] for i in row if i >= 0} for row in truth_ids]
+
+    result["modes"] = {}
+    for mode in MODES:
+        latencies, recalls = [], []
+        for query, vector, expected in zip(queries, vectors, truth):
+            hits, elapsed = timed(_search, db, mode, [query], vector[None, :], k)
+            latencies.append(elapsed)
+            recalls.append(len(_texts(hits[0]) & expected) / max(len(expected), 1))
+        result["modes"][mode] = {
+            "p50_ms": percentile_ms(latencies, 50),
+            "p95_ms": percentile_ms(latencies, 95),
+            f"recall_at_{k}": float(np.mean(recalls)),
+        }
+
+    repeated = np.resize(vectors, (THROUGHPUT_QUERIES, vectors.shape[1]))
+    result["throughput_qps"] = {}
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        for pos in range(0, len(repeated), batch_size):
+            search_vectors(db, repeated[pos:pos + batch_size], k)
+        result["throughput_qps"][str(batch_size)] = len(repeated) / (time.perf_counter() - start)
+    return result
+
+
+def run(k: int = 3, output=None) -> dict:
+    embeddings = get_embeddings()
+    uncached = ParallelEmbeddings(EMBED_MODEL)
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "k": k,
+        "batch_sizes": BATCH_SIZES,
+        "snapshots": {},
+    }
+
+    embed_latencies = []
+    for _, path in list_snapshots().items():
+        queries = headline_queries(path)
+        if not queries:
+            continue
+        # The first call loads the model; keep it out of the latencies.
+        embed_queries(uncached, queries[:1])
+        rows = []
+        for query in queries:
+            vector, elapsed = timed(embed_queries, uncached, [query])
+            embed_latencies.append(elapsed)
+            rows.append(vector[0])
+        vectors = np.stack(rows)
+
+        print(f"🔄 Benchmarking {path.name} ({len(queries)} queries)...")
+        report["snapshots"][path.name] = bench_snapshot(path, embeddings, queries, vectors, k)
+
+    report["embed"] = {
+        "p50_ms": percentile_ms(embed_latencies, 50),
+        "p95_ms": percentile_ms(embed_latencies, 95),
+    }
+    report["peak_rss_mb"] = rss_mb()
+
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"retrieval-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in report["snapshots"].items():
+        dense = result["modes"]["dense"]
+        print(
+            f"  {name:<22} load {result['load_s'] * 1000:.1f}ms  "
+            f"dense p50 {dense['p50_ms']:.2f}ms p95 {dense['p95_ms']:.2f}ms  "
+            f"qps@64 {result['throughput_qps']['64']:.0f}"
+        )
+    print(f"✅ Benchmark results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,130 @@
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
+
+# Chunk texts, stored as one contiguous UTF-8 file plus an offsets array.
+CHUNKS_FILE = "chunks.bin"
+# Folder holding one text/offsets pair per metadata key (JSON-encoded values).
+METADATA_DIR = "metadata"
+
+
+def _write_column(bin_path: Path, values: list[str]):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    with open(bin_path, "wb") as f:
+        for value in encoded:
+            f.write(value)
+    np.save(bin_path.with_suffix(".offsets.npy"), offsets)
+
+
+class _StringColumn:
+    """A memory-mapped column of strings, decoded one row at a time."""
+
+    def __init__(self, bin_path: Path):
+        self.offsets = np.load(bin_path.with_suffix(".offsets.npy"), mmap_mode="r")
+        # np.memmap cannot map an empty file, which is what a column of empty strings is.
+        if bin_path.stat().st_size:
+            self.data = np.memmap(bin_path, dtype=np.uint8, mode="r")
+        else:
+            self.data = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self.data[start:end].tobytes().decode("utf-8")
+
+
+def write_chunk_store(path: Path, documents: list[Document]):
+    """
+    Writes documents in the memory-mappable chunk store format. Row i of the
+    store must belong to vector i of the FAISS index saved next to it.
+
+    Args:
+        path: The snapshot directory to write into.
+        documents: The chunk documents, in index order.
+    """
+    path = Path(path)
+    _write_column(path / CHUNKS_FILE, [doc.page_content for doc in documents])
+
+    columns = sorted({key for doc in documents for key in doc.metadata})
+    metadata_dir = path / METADATA_DIR
+    metadata_dir.mkdir(exist_ok=True)
+    for column in columns:
+        values = [json.dumps(doc.metadata.get(column), ensure_ascii=False) for doc in documents]
+        _write_column(metadata_dir / f"{column}.bin", values)
+
+
+def has_chunk_store(path: Path) -> bool:
+    """Returns whether a snapshot directory holds a memory-mapped chunk store."""
+    return (Path(path) / CHUNKS_FILE).exists()
+
+
+class MmapDocstore(Docstore):
+    """
+    Read-only docstore over a chunk store written by `write_chunk_store`.
+
+    Nothing is decoded at load time; a Document is built only for the ids a
+    search actually returns, so memory use does not grow with the corpus.
+    Ids are the string form of the FAISS row number.
+    """
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        self.texts = _StringColumn(path / CHUNKS_FILE)
+        metadata_dir = path / METADATA_DIR
+        self.columns = {}
+        if metadata_dir.exists():
+            for bin_path in sorted(metadata_dir.glob("*.bin")):
+                self.columns[bin_path.stem] = _StringColumn(bin_path)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(self, search: str) -> Document | str:
+        row = int(search)
+        if not 0 <= row < len(self.texts):
+            return f"ID {search} not found."
+        metadata = {}
+        for name, column in self.columns.items():
+            value = json.loads(column[row])
+            if value is not None:
+                metadata[name] = value
+        return Document(id=search, page_content=self.texts[row], metadata=metadata)
+
+    def add(self, texts: dict[str, Document]) -> None:
+        raise RuntimeError(
+            "MmapDocstore is read-only; convert it with to_in_memory() before adding documents."
+        )
+
+    def delete(self, ids: list) -> None:
+        raise RuntimeError("MmapDocstore is read-only; convert it with to_in_memory() before deleting documents.")
+
+    def to_in_memory(self) -> InMemoryDocstore:
+        """Decodes every chunk into an InMemoryDocstore keyed by the same ids."""
+        return InMemoryDocstore({str(row): self.search(str(row)) for row in range(len(self))})
+
+
+class RowIdMap(Mapping):
+    """Maps FAISS row i to docstore id str(i) without materializing a dict."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __getitem__(self, row: int) -> str:
+        if not 0 <= row < self.size:
+            raise KeyError(row)
+        return str(row)
+
+    def __iter__(self):
+        return iter(range(self.size))
+
+    def __len__(self) -> int:
+        return self.size
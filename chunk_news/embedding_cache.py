@@ -0,0 +1,331 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk store of embedding vectors.
+
+    Vectors are appended to one float32 matrix file that is read through a
+    memory map, and the sha256 of (model + text) of every row is appended to a
+    parallel keys file, so a put only writes its new rows. The keys are read on
+    first use rather than when the cache is created. The cache is meant for a
+    single writing process at a time.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    KEYS_FILE = "keys.bin"
+    META_FILE = "meta.json"
+    # Written by earlier versions; converted to KEYS_FILE on first use.
+    LEGACY_INDEX_FILE = "index.json"
+    KEY_BYTES = 32
+
+    def __init__(self, cache_dir: Path, model_name: str):
+        self.cache_dir = Path(cache_dir)
+        self.model_name = model_name
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.cache_dir / self.VECTORS_FILE
+        self.keys_path = self.cache_dir / self.KEYS_FILE
+        self.meta_path = self.cache_dir / self.META_FILE
+
+        self.dim = None
+        self._rows = None
+        self._n_rows = 0
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def rows(self) -> dict:
+        """Maps every cache key to its row of the vectors file."""
+        self._load()
+        return self._rows
+
+    def key(self, text: str) -> str:
+        """Returns the cache key of a text for this cache's model."""
+        return hashlib.sha256(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    def _migrate_legacy_index(self):
+        legacy_path = self.cache_dir / self.LEGACY_INDEX_FILE
+        if self.meta_path.exists() or not legacy_path.exists():
+            return
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        # Rows the old index never referenced get an all-zero key.
+        keys = bytearray(self.KEY_BYTES * (max(index["rows"].values(), default=-1) + 1))
+        for key, row in index["rows"].items():
+            keys[row * self.KEY_BYTES:(row + 1) * self.KEY_BYTES] = bytes.fromhex(key)
+        with open(self.keys_path, "wb") as f:
+            f.write(keys)
+        self._write_meta(index["dim"])
+        os.remove(legacy_path)
+
+    def _write_meta(self, dim: int):
+        self.dim = dim
+        tmp_path = self.meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "dim": dim}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _load(self):
+        if self._rows is not None:
+            return
+        with self._lock:
+            if self._rows is not None:
+                return
+            self._migrate_legacy_index()
+            rows = {}
+            n_rows = 0
+            if self.meta_path.exists():
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    self.dim = json.load(f)["dim"]
+                # A run that died between the two appends leaves one file
+                # longer than the other; only rows present in both count.
+                keys = self.keys_path.read_bytes() if self.keys_path.exists() else b""
+                n_vectors = self.vectors_path.stat().st_size // (self.dim * 4) if self.vectors_path.exists() else 0
+                n_rows = min(len(keys) // self.KEY_BYTES, n_vectors)
+                for row in range(n_rows):
+                    rows[keys[row * self.KEY_BYTES:(row + 1) * self.KEY_BYTES].hex()] = row
+            self._n_rows = n_rows
+            self._rows = rows
+
+    def _open_matrix(self):
+        if self._matrix is None:
+            if self._n_rows == 0:
+                return None
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(self._n_rows, self.dim)
+            )
+        return self._matrix
+
+    def get(self, keys: list[str]) -> list:
+        """
+        Looks up cached vectors.
+
+        Args:
+            keys: Cache keys as returned by `key`.
+
+        Returns:
+            A list aligned with `keys` holding a float32 vector for every hit
+            and None for every miss.
+        """
+        rows = self.rows
+        matrix = self._open_matrix()
+        results = []
+        for key in keys:
+            row = rows.get(key)
+            results.append(None if row is None or matrix is None else np.array(matrix[row]))
+        return results
+
+    def put(self, keys: list[str], vectors) -> None:
+        """
+        Appends vectors and their keys to the cache files.
+
+        Args:
+            keys: Cache keys as returned by `key`.
+            vectors: The vectors for `keys`, in the same order.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(keys) == 0:
+            return
+        self._load()
+        with self._lock:
+            if self.dim is None:
+                self._write_meta(int(vectors.shape[1]))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match cache dimension {self.dim}."
+                )
+
+            start = self._n_rows
+            self._matrix = None
+            # Cut off rows a crashed run wrote to only one of the files, so
+            # the two stay aligned.
+            for path, row_bytes in ((self.vectors_path, self.dim * 4), (self.keys_path, self.KEY_BYTES)):
+                if path.exists() and path.stat().st_size != start * row_bytes:
+                    os.truncate(path, start * row_bytes)
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.write(b"".join(bytes.fromhex(key) for key in keys))
+            for offset, key in enumerate(keys):
+                self._rows[key] = start + offset
+            self._n_rows = start + len(keys)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document vectors from an EmbeddingCache and
+    only runs the wrapped model on texts it has never seen.
+
+    Queries go straight to the wrapped model: they are not written to the
+    cache, and a process that only embeds queries never reads it.
+    """
+
+    def __init__(self, base: Embeddings, cache: EmbeddingCache):
+        self.base = base
+        self.cache = cache
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.cache.key(text) for text in texts]
+        vectors = self.cache.get(keys)
+
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+
+        if missing:
+            fresh = self.base.embed_documents(list(missing.values()))
+            self.cache.put(list(missing.keys()), fresh)
+            fresh_by_key = dict(zip(missing.keys(), fresh))
+            vectors = [
+                fresh_by_key[key] if vector is None else vector
+                for key, vector in zip(keys, vectors)
+            ]
+
+        print(f"-> Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+        return [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.base.embed_query(text)
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embeds several queries with the wrapped model, without touching the cache."""
+        if hasattr(self.base, "embed_queries"):
+            return self.base.embed_queries(texts)
+        return [self.base.embed_query(text) for text in texts]
+
+
+class QueryEmbeddingCache(Embeddings):
+    """
+    Bounded LRU cache of query vectors in front of an Embeddings object.
+
+    Agents keep re-sending the same strings ("Nvidia news 07/10/2025", the
+    headline text, keywords a leader repeats to every worker), so query
+    vectors are kept in memory keyed by the normalized query text. With a
+    `path`, the cache is loaded from and saved to an .npz file so a re-run on
+    the same day starts warm. Document embedding passes straight through.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        max_size: int = 1024,
+        path: Path | None = None,
+        model_name: str = "",
+        lowercase: bool = False,
+    ):
+        self.base = base
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self.model_name = model_name
+        self.lowercase = lowercase
+        self.hits = 0
+        self.misses = 0
+        self._vectors = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def normalize(self, text: str) -> str:
+        """Returns the cache key of a query: whitespace collapsed, optionally lowercased."""
+        text = " ".join(text.split())
+        return text.lower() if self.lowercase else text
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters and the current number of cached queries."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._vectors)}
+
+    def _read_file(self) -> OrderedDict:
+        if not self.path.exists():
+            return OrderedDict()
+        with np.load(self.path, allow_pickle=False) as data:
+            if str(data["model"]) != self.model_name:
+                return OrderedDict()
+            keys, vectors = data["keys"], data["vectors"]
+        return OrderedDict((str(key), vector) for key, vector in zip(keys[-self.max_size:], vectors[-self.max_size:]))
+
+    def _load(self):
+        self._vectors = self._read_file()
+
+    def save(self):
+        """
+        Writes the cache to its file, if it has one and anything changed.
+
+        Queries already in the file that this cache does not hold (saved by
+        another cache on the same file, in this or another process) are kept
+        as the least recently used entries, so the last writer does not drop
+        them.
+        """
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            merged = self._read_file()
+            for key, vector in self._vectors.items():
+                merged.pop(key, None)
+                merged[key] = vector
+            while len(merged) > self.max_size:
+                merged.popitem(last=False)
+            keys = np.array(list(merged), dtype=str)
+            vectors = np.array(list(merged.values()), dtype=np.float32)
+            self._dirty = False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".tmp-{os.getpid()}.npz")
+            np.savez(tmp_path, model=np.array(self.model_name), keys=keys, vectors=vectors)
+            os.replace(tmp_path, self.path)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embeds several queries, running the model once for all LRU misses."""
+        keys = [self.normalize(text) for text in texts]
+        vectors = [None] * len(texts)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._vectors.get(key)
+                if vector is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._vectors.move_to_end(key)
+                    vectors[i] = vector
+            self.hits += len(texts) - sum(len(rows) for rows in missing.values())
+            self.misses += len(missing)
+
+        if missing:
+            # Embed the normalized text so the cached vector is the same
+            # whichever spelling of the query filled the slot.
+            missing_texts = list(missing)
+            if hasattr(self.base, "embed_queries"):
+                fresh = self.base.embed_queries(missing_texts)
+            else:
+                fresh = [self.base.embed_query(text) for text in missing_texts]
+            with self._lock:
+                for key, vector in zip(missing_texts, fresh):
+                    vector = np.asarray(vector, dtype=np.float32)
+                    for i in missing[key]:
+                        vectors[i] = vector
+                    self._vectors[key] = vector
+                    self._vectors.move_to_end(key)
+                while len(self._vectors) > self.max_size:
+                    self._vectors.popitem(last=False)
+                self._dirty = True
+        return [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
@@ -0,0 +1,118 @@
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+# The model loaded by each process of the embedding pool.
+_worker_model = None
+
+
+def _load_model(model_name: str, batch_size: int) -> HuggingFaceEmbeddings:
+    return HuggingFaceEmbeddings(
+        model_name=model_name, encode_kwargs={"batch_size": batch_size}
+    )
+
+
+def _init_worker(model_name: str, batch_size: int, threads: int):
+    """Loads the model once per pool process and caps its torch threads."""
+    global _worker_model
+    import torch
+
+    # Without this every process would start one thread per core.
+    torch.set_num_threads(threads)
+    _worker_model = _load_model(model_name, batch_size)
+
+
+def _embed_batch(texts: list[str]) -> np.ndarray:
+    return np.asarray(_worker_model.embed_documents(texts), dtype=np.float32)
+
+
+class ParallelEmbeddings(Embeddings):
+    """
+    Embeddings that encode documents in length-sorted batches, optionally
+    sharded over a pool of processes, and report their throughput.
+
+    Sorting by length keeps texts of similar size in the same batch, so less
+    work is spent on padding. With workers > 1 every process loads its own
+    copy of the model and the batches are spread over the pool. The pool is
+    started on first use and kept for later calls (a streaming build embeds
+    one batch of chunks per call) until close() or interpreter exit.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32, workers: int = 1):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self._model = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def model(self) -> HuggingFaceEmbeddings:
+        if self._model is None:
+            self._model = _load_model(self.model_name, self.batch_size)
+        return self._model
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                threads = max(1, (os.cpu_count() or 1) // self.workers)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.batch_size, threads),
+                )
+                atexit.register(self.close)
+            return self._pool
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            atexit.unregister(self.close)
+            pool.shutdown()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        start = time.perf_counter()
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [
+            [texts[i] for i in order[pos:pos + self.batch_size]]
+            for pos in range(0, len(order), self.batch_size)
+        ]
+
+        if self.workers == 1 or len(batches) == 1:
+            parts = [np.asarray(self.model.embed_documents(batch), dtype=np.float32) for batch in batches]
+        else:
+            parts = list(self.pool.map(_embed_batch, batches))
+
+        # Put the vectors back into the caller's order.
+        sorted_vectors = np.concatenate(parts)
+        vectors = np.empty_like(sorted_vectors)
+        vectors[order] = sorted_vectors
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"-> Embedded {len(texts)} chunks in {elapsed:.1f}s "
+            f"({len(texts) / max(elapsed, 1e-9):.1f} chunks/sec, "
+            f"batch_size={self.batch_size}, workers={self.workers})"
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.model.embed_query(text)
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embeds several queries in-process with a single encode call."""
+        if not texts:
+            return []
+        return self.model.embed_documents(texts)
@@ -0,0 +1,156 @@
+import math
+
+import faiss
+import numpy as np
+
+# Index kinds and their default parameters. A spec is written as the kind
+# optionally followed by overrides, e.g. "flat", "ivf:nlist=256,nprobe=16",
+# "hnsw:m=32,ef_search=64", "sq8" (int8 scalar quantizer) or "pq:m=48".
+# "pq" is an IVF-PQ index whose single list makes it an exhaustive PQ scan;
+# raising its nlist turns it into a partitioned IVF-PQ index.
+# "pca" and "opq" learn a projection to `dim` dimensions (OPQ: a rotation
+# trained for m sub-vectors) and store the reduced vectors as float16. The
+# projection is part of the index, so queries are projected automatically.
+INDEX_DEFAULTS = {
+    "flat": {},
+    "ivf": {"nlist": 100, "nprobe": 8},
+    "hnsw": {"m": 32, "ef_construction": 40, "ef_search": 64},
+    "sq8": {},
+    "pq": {"m": 48, "nbits": 8, "nlist": 1, "nprobe": 1},
+    "pca": {"dim": 128},
+    "opq": {"dim": 128, "m": 16},
+}
+# OPQ trains an 8-bit codebook per sub-vector, so it needs this many vectors.
+OPQ_MIN_TRAIN = 256
+
+
+def parse_index_spec(spec: str) -> dict:
+    """
+    Parses an index spec string.
+
+    Args:
+        spec: E.g. "flat", "ivf:nlist=256,nprobe=16" or "hnsw:ef_search=128".
+
+    Returns:
+        A dict with the "kind" and every parameter, defaults filled in.
+    """
+    kind, _, args = (spec or "flat").strip().lower().partition(":")
+    if kind not in INDEX_DEFAULTS:
+        raise ValueError(f"Unknown index kind {kind!r}; choose from {sorted(INDEX_DEFAULTS)}")
+    params = dict(INDEX_DEFAULTS[kind])
+    for arg in filter(None, args.split(",")):
+        name, _, value = arg.partition("=")
+        if name not in params:
+            raise ValueError(f"Unknown parameter {name!r} for {kind} index; known: {sorted(params)}")
+        params[name] = int(value)
+    return {"kind": kind, **params}
+
+
+def build_index(spec: str, vectors: np.ndarray):
+    """
+    Creates, trains and fills a FAISS index described by a spec.
+
+    Parameters that need more training points than the corpus has (IVF lists,
+    PQ centroids) are scaled down so small daily snapshots still build.
+
+    Args:
+        spec: The index spec string.
+        vectors: The (n, d) float32 vectors to index, in row order.
+
+    Returns:
+        The FAISS index, with its search parameters applied.
+    """
+    params = parse_index_spec(spec)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, d = vectors.shape
+    kind = params["kind"]
+
+    if kind == "flat":
+        index = faiss.IndexFlatL2(d)
+    elif kind == "ivf":
+        # FAISS wants roughly 39 training points per list.
+        nlist = max(1, min(params["nlist"], n // 39))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(d), d, nlist, faiss.METRIC_L2)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(d, params["m"])
+        index.hnsw.efConstruction = params["ef_construction"]
+    elif kind == "sq8":
+        index = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+    elif kind in ("pca", "opq"):
+        # PCA cannot learn more components than there are vectors.
+        dim = max(1, min(params["dim"], d, n))
+        if kind == "opq" and n >= OPQ_MIN_TRAIN:
+            if dim % params["m"]:
+                raise ValueError(f"opq m={params['m']} must divide dim={dim}")
+            transform = faiss.OPQMatrix(d, params["m"], dim)
+        else:
+            # Also used by opq when there are too few vectors to train its rotation.
+            transform = faiss.PCAMatrix(d, dim)
+        index = faiss.IndexPreTransform(
+            transform, faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2)
+        )
+    else:
+        if d % params["m"]:
+            raise ValueError(f"pq m={params['m']} must divide the embedding dimension {d}")
+        nbits = max(1, min(params["nbits"], int(math.log2(max(n, 2)))))
+        nlist = max(1, min(params["nlist"], n // 39))
+        # IndexPQ itself rejects SearchParameters, so metadata filters could
+        # not be applied to it; the IVF wrapper accepts them.
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(d), d, nlist, params["m"], nbits)
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    apply_search_params(index, spec)
+    return index
+
+
+def apply_search_params(index, spec: str):
+    """
+    Sets the search-time parameters of a spec (nprobe, efSearch) on an index.
+
+    Args:
+        index: A FAISS index of the spec's kind.
+        spec: The index spec string.
+    """
+    params = parse_index_spec(spec)
+    if params["kind"] in ("ivf", "pq"):
+        faiss.extract_index_ivf(index).nprobe = params["nprobe"]
+    elif params["kind"] == "hnsw":
+        index.hnsw.efSearch = params["ef_search"]
+
+
+def search_parameters(index, selector=None):
+    """
+    Returns the SearchParameters object FAISS expects for an index type,
+    carrying the index's own nprobe / efSearch so passing a selector does not
+    reset them to FAISS's defaults.
+
+    Args:
+        index: The FAISS index about to be searched.
+        selector: Optional IDSelector restricting the searched rows.
+
+    Returns:
+        A faiss SearchParameters instance, or None if there is nothing to pass.
+    """
+    if selector is None:
+        return None
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def enable_reconstruct(index):
+    """
+    Lets `index.reconstruct_batch` look vectors up by id. IVF-based indexes
+    (ivf, pq) need an id -> inverted-list map for that, which FAISS does not
+    keep unless asked; other kinds support it as they are.
+
+    Args:
+        index: A FAISS index; it is modified in place.
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and ivf.direct_map.type == faiss.DirectMap.NoMap:
+        ivf.make_direct_map()
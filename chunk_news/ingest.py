@@ -0,0 +1,232 @@
+"""
+Text phase of building a vector DB: parsing the news JSON, cleaning and
+formatting articles, and splitting them into chunks.
+
+`iter_chunk_batches` runs it as a stream: articles are parsed incrementally
+from the file, cleaned and split on a process pool a batch at a time, and
+the chunks are yielded while the next batches are still being prepared, so
+a multi-month dataset never has to be in memory as a whole.
+"""
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+# Bytes read from the JSON file per refill of the streaming parser.
+READ_SIZE = 1 << 20
+
+_URL_PATTERN = re.compile(r"http\S+")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def clean_text(text: str) -> str:
+    """
+    Removes URLs and collapses excess whitespace from a string.
+    Handles None or empty inputs gracefully.
+
+    Args:
+        text: The input string to clean.
+
+    Returns:
+        The cleaned string.
+    """
+    if not text:
+        return ""
+    # Remove URLs
+    text = _URL_PATTERN.sub("", text)
+    # Reduce whitespace, newlines included, to a single space
+    return _SPACE_PATTERN.sub(" ", text).strip()
+
+
+def news_document(category: str, item: dict) -> Document:
+    """
+    Formats one article of a news JSON file as a Document.
+
+    Args:
+        category: The chipmaker the article is filed under.
+        item: The article, with headline, content, source, url and timestamp.
+
+    Returns:
+        A Document whose metadata holds category, date (YYYY-MM-DD), source,
+        headline and url.
+    """
+    content = clean_text(item.get("content", ""))
+    full_text = (
+        f"Category: {category}\n"
+        f"Headline: {item.get('headline','')}\n"
+        f"Source: {item.get('source','')}\n"
+        f"Content: {content}\n"
+        f"Timestamp: {item.get('timestamp','')}"
+    )
+    metadata = {
+        "category": category,
+        "date": (item.get("timestamp") or "")[:10],
+        "source": item.get("source", ""),
+        "headline": item.get("headline", ""),
+        "url": item.get("url", ""),
+    }
+    return Document(page_content=full_text, metadata=metadata)
+
+
+def doc_key(doc: str | Document) -> str:
+    """
+    Returns the content hash used to recognise a document that is already indexed.
+
+    Args:
+        doc: The formatted news document, as a string or a Document.
+
+    Returns:
+        A hex SHA-256 digest of the document text.
+    """
+    text = doc.page_content if isinstance(doc, Document) else doc
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_splitter() -> RecursiveCharacterTextSplitter:
+    """Returns the text splitter shared by the build and update paths."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=500, chunk_overlap=50, separators=["\n\n", "\n", ".", " "]
+    )
+
+
+def split_docs(docs: list[Document], keys: list[str], splitter: RecursiveCharacterTextSplitter):
+    """
+    Splits documents into chunks. Every chunk keeps its article's metadata and
+    is tagged with its document key.
+    """
+    tagged = [
+        Document(page_content=doc.page_content, metadata={**doc.metadata, "doc_key": key})
+        for doc, key in zip(docs, keys)
+    ]
+    return splitter.split_documents(tagged)
+
+
+def iter_news_items(path: Path, read_size: int = READ_SIZE):
+    """
+    Parses a news JSON file ({"Nvidia": [article, ...], ...}) incrementally.
+
+    Only one read buffer and the article being decoded are held in memory,
+    however large the file is.
+
+    Args:
+        path: The JSON file.
+        read_size: Bytes read per refill.
+
+    Yields:
+        (category, article dict) pairs in file order.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer, pos, eof = "", 0, False
+
+        def peek() -> str:
+            # Returns the next non-whitespace character, refilling as needed.
+            nonlocal buffer, pos, eof
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return buffer[pos:pos + 1]
+                buffer, pos = f.read(read_size), 0
+                eof = not buffer
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            char = peek()
+            if not char or char not in chars:
+                raise ValueError(f"Malformed news file {path}: expected one of {chars!r}, got {char!r}")
+            pos += 1
+            return char
+
+        def value():
+            # Decodes the next JSON value, reading more until it is complete.
+            nonlocal buffer, pos, eof
+            peek()
+            while True:
+                try:
+                    result, end = decoder.raw_decode(buffer, pos)
+                    # A number at the buffer's end may continue in the next read.
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return result
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                more = f.read(read_size)
+                eof = not more
+                buffer, pos = buffer[pos:] + more, 0
+
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            category = value()
+            expect(":")
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield category, value()
+                    if expect(",]") == "]":
+                        break
+            if expect(",}") == "}":
+                return
+
+
+def _prepare_articles(batch: list[tuple[str, dict]]) -> tuple[list[str], list[Document]]:
+    """
+    Pool task: formats a batch of articles, drops exact duplicates within the
+    batch and splits the rest into chunks.
+    """
+    keyed_docs = {}
+    for category, item in batch:
+        doc = news_document(category, item)
+        keyed_docs.setdefault(doc_key(doc), doc)
+    keys = list(keyed_docs)
+    return keys, split_docs(list(keyed_docs.values()), keys, make_splitter())
+
+
+def _article_batches(path: Path, batch_size: int):
+    batch = []
+    for entry in iter_news_items(path):
+        batch.append(entry)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_chunk_batches(path: Path, workers: int = 1, batch_size: int = 64):
+    """
+    Streams a news JSON file through cleaning and splitting.
+
+    Args:
+        path: The news JSON file.
+        workers: Processes the text phase is fanned out over; 1 runs it in
+            the calling process.
+        batch_size: Articles per pool task.
+
+    Yields:
+        (doc_keys, chunks) per batch of articles, in file order. At most
+        2 * workers batches are in flight, which bounds memory use.
+    """
+    batches = _article_batches(path, batch_size)
+    if workers <= 1:
+        for batch in batches:
+            yield _prepare_articles(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(_prepare_articles, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
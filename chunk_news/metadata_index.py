@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+# Sidecar file holding the precomputed id bitmaps of a snapshot.
+FILTERS_FILE = "filters.npz"
+# Chunk metadata fields that get one bitmap per distinct value.
+FILTER_FIELDS = ("category", "date")
+
+
+def _normalize(field: str, value) -> str:
+    value = str(value).strip()
+    if field == "date":
+        # Timestamps may carry a time part; bitmaps are per day.
+        return value[:10]
+    return value.lower()
+
+
+class MetadataFilters:
+    """
+    Precomputed id bitmaps for filtered search, one per category and per day.
+
+    Bit i of a bitmap is set when FAISS row i belongs to that category or day.
+    A filter like {"category": "Intel", "date": "2025-09-23"} is answered by
+    OR-ing the bitmaps of each field's values and AND-ing the fields, and is
+    handed to FAISS as an IDSelectorBitmap, so the index only scores matching
+    rows instead of over-fetching and post-filtering.
+    """
+
+    def __init__(self, size: int, bitmaps: dict[str, np.ndarray]):
+        self.size = size
+        # "field=value" -> bitmap packed little-endian, as IDSelectorBitmap expects.
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def build(cls, documents: list[Document]) -> "MetadataFilters":
+        """
+        Computes the bitmaps of a snapshot.
+
+        Args:
+            documents: The chunk documents, in index order.
+
+        Returns:
+            The MetadataFilters of the snapshot.
+        """
+        rows = {}
+        for row, doc in enumerate(documents):
+            # A chunk merged from near-duplicate articles (see near_dup.py)
+            # matches the categories and days of all of them.
+            for entry in [doc.metadata, *doc.metadata.get("sources", [])]:
+                for field in FILTER_FIELDS:
+                    value = entry.get(field)
+                    if value:
+                        rows.setdefault(f"{field}={_normalize(field, value)}", set()).add(row)
+
+        bitmaps = {}
+        for key, ids in rows.items():
+            bits = np.zeros(len(documents), dtype=bool)
+            bits[list(ids)] = True
+            bitmaps[key] = np.packbits(bits, bitorder="little")
+        return cls(len(documents), bitmaps)
+
+    def save(self, path: Path):
+        np.savez(Path(path) / FILTERS_FILE, __size__=np.array([self.size]), **self.bitmaps)
+
+    @classmethod
+    def load(cls, path: Path) -> "MetadataFilters | None":
+        """Loads the bitmaps of a snapshot, or returns None if it has none."""
+        filters_path = Path(path) / FILTERS_FILE
+        if not filters_path.exists():
+            return None
+        with np.load(filters_path) as data:
+            bitmaps = {key: data[key] for key in data.files if key != "__size__"}
+            return cls(int(data["__size__"][0]), bitmaps)
+
+    def values(self, field: str) -> list[str]:
+        """Returns the known values of a filter field, e.g. every indexed day."""
+        prefix = f"{field}="
+        return sorted(key[len(prefix):] for key in self.bitmaps if key.startswith(prefix))
+
+    def mask(self, criteria: dict) -> np.ndarray:
+        """
+        Combines the bitmaps for a filter.
+
+        Args:
+            criteria: Field -> value or list of values, e.g.
+                {"category": "Intel", "date": ["2025-09-22", "2025-09-23"]}.
+
+        Returns:
+            The packed bitmap of the matching rows.
+        """
+        result = np.full((self.size + 7) // 8, 0xFF, dtype=np.uint8)
+        for field, values in criteria.items():
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"Cannot filter on {field!r}; supported fields: {FILTER_FIELDS}")
+            if isinstance(values, str):
+                values = [values]
+            field_mask = np.zeros_like(result)
+            for value in values:
+                bitmap = self.bitmaps.get(f"{field}={_normalize(field, value)}")
+                if bitmap is not None:
+                    field_mask |= bitmap
+            result &= field_mask
+        return result
@@ -0,0 +1,224 @@
+import zlib
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+from chunk_news.sparse_index import tokenize
+
+# Word n-grams hashed into each chunk's MinHash signature.
+SHINGLE_SIZE = 3
+# Signature length, split into BANDS bands of NUM_PERM // BANDS rows for LSH.
+# 16 bands of 8 rows make chunks above roughly 0.7 Jaccard likely to collide.
+NUM_PERM = 128
+BANDS = 16
+# Estimated Jaccard similarity above which two chunks count as the same text.
+DEDUP_THRESHOLD = 0.8
+# Chunks with fewer tokens (a bare "Timestamp: ..." line, a lone ".") carry no
+# fact of their own and are never merged.
+MIN_TOKENS = 8
+# Signatures of a snapshot's chunks, one row per index row, so that updates
+# do not recompute them for every chunk already indexed.
+SIGNATURES_FILE = "minhash.npy"
+# Article metadata kept for every copy merged into a representative chunk.
+SOURCE_FIELDS = ("source", "headline", "url", "date", "category", "doc_key")
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.int64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.int64)
+
+
+def minhash(text: str) -> np.ndarray | None:
+    """
+    Returns the MinHash signature of a text's word shingles.
+
+    Args:
+        text: The chunk text.
+
+    Returns:
+        A (NUM_PERM,) int64 signature, or None for texts under MIN_TOKENS tokens.
+    """
+    tokens = tokenize(text)
+    if len(tokens) < MIN_TOKENS:
+        return None
+    shingles = {
+        " ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+    hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.int64) % _PRIME
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def signature_matrix(docs: list[Document], known: np.ndarray | None = None) -> np.ndarray:
+    """
+    Returns the MinHash signatures of a list of chunks as one array.
+
+    Args:
+        docs: The chunks, e.g. every document of a snapshot in index order.
+        known: Signatures of the first chunks, already computed; only the
+            chunks after them are hashed.
+
+    Returns:
+        A (len(docs), NUM_PERM) int64 array, with a row of -1 for every
+        chunk too short to have a signature.
+    """
+    signatures = np.full((len(docs), NUM_PERM), -1, dtype=np.int64)
+    start = 0 if known is None else len(known)
+    if start:
+        signatures[:start] = known
+    for row, doc in enumerate(docs[start:], start):
+        signature = minhash(doc.page_content)
+        if signature is not None:
+            signatures[row] = signature
+    return signatures
+
+
+def save_signatures(path: Path, signatures: np.ndarray):
+    np.save(Path(path) / SIGNATURES_FILE, signatures)
+
+
+def load_signatures(path: Path) -> np.ndarray | None:
+    """Returns the signatures saved with a snapshot, or None if it has none."""
+    signatures_path = Path(path) / SIGNATURES_FILE
+    if not signatures_path.exists():
+        return None
+    return np.load(signatures_path)
+
+
+def source_entry(doc: Document) -> dict:
+    """Returns the article fields of a chunk that are recorded in "sources"."""
+    return {field: doc.metadata[field] for field in SOURCE_FIELDS if field in doc.metadata}
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of the chunks kept so far, answering "has a
+    near-identical chunk been seen?".
+
+    Each signature is cut into BANDS bands and every band is a bucket key;
+    chunks sharing a bucket are candidates, confirmed when their signatures
+    agree on at least `threshold` of their rows. The index can be fed batch
+    after batch, e.g. by a streaming build.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = []
+        self.documents = []
+        self.buckets = {}
+        # id(chunk) -> item for the chunks kept by the last dedup call.
+        self._recent = {}
+
+    def _bands(self, signature: np.ndarray):
+        rows = NUM_PERM // BANDS
+        for band in range(BANDS):
+            yield band, signature[band * rows:(band + 1) * rows].tobytes()
+
+    def query(self, signature: np.ndarray) -> Document | None:
+        """Returns a kept chunk that is a near-duplicate of a signature, or None."""
+        candidates = set()
+        for key in self._bands(signature):
+            candidates.update(self.buckets.get(key, ()))
+        for item in sorted(candidates):
+            if np.mean(self.signatures[item] == signature) >= self.threshold:
+                return self.documents[item]
+        return None
+
+    def add(self, signature: np.ndarray, doc: Document):
+        """Adds a kept chunk under its signature."""
+        item = len(self.signatures)
+        self.signatures.append(signature)
+        self.documents.append(doc)
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, []).append(item)
+
+    def dedup(self, chunks: list[Document]) -> list[Document]:
+        """
+        Merges every chunk that near-duplicates a kept chunk into it and
+        keeps the others.
+
+        Args:
+            chunks: The chunks about to be embedded.
+
+        Returns:
+            The chunks that still need embedding, in their original order.
+        """
+        kept = []
+        self._recent = {}
+        for chunk in chunks:
+            signature = minhash(chunk.page_content)
+            if signature is None:
+                kept.append(chunk)
+                continue
+            match = self.query(signature)
+            if match is None:
+                self._recent[id(chunk)] = len(self.documents)
+                self.add(signature, chunk)
+                kept.append(chunk)
+            else:
+                merge_duplicate(match, chunk)
+
+        dropped = len(chunks) - len(kept)
+        if dropped:
+            print(f"-> Near-duplicate chunks merged: {dropped} of {len(chunks)}")
+        return kept
+
+
+    def replace_kept(self, kept: list[Document], stored: list[Document]):
+        """
+        Points the chunks kept by the last dedup call at other objects, e.g.
+        the copies a vector store made when adding them, so later merges
+        update the copies that get saved.
+
+        Args:
+            kept: The list returned by the last dedup call.
+            stored: The replacement for each of them, in the same order.
+        """
+        for chunk, doc in zip(kept, stored):
+            item = self._recent.get(id(chunk))
+            if item is not None:
+                self.documents[item] = doc
+        self._recent = {}
+
+
+def merge_duplicate(representative: Document, duplicate: Document):
+    """Records a near-duplicate chunk's article in the representative's "sources"."""
+    sources = representative.metadata.setdefault("sources", [source_entry(representative)])
+    entry = source_entry(duplicate)
+    if entry not in sources:
+        sources.append(entry)
+
+
+def dedup_chunks(
+    chunks: list[Document],
+    existing: list[Document] | None = None,
+    threshold: float = DEDUP_THRESHOLD,
+    signatures: np.ndarray | None = None,
+) -> list[Document]:
+    """
+    Drops chunks that are near-duplicates of an earlier chunk, e.g. the same
+    Reuters story syndicated by several outlets.
+
+    The first copy is kept as the representative and every merged copy's
+    article is listed in its metadata["sources"].
+
+    Args:
+        chunks: The chunks about to be embedded.
+        existing: Chunks already in the index; new chunks that duplicate one
+            of them are merged into it (its metadata is updated in place).
+        threshold: Estimated Jaccard similarity at which chunks are merged.
+        signatures: The existing chunks' signatures from signature_matrix,
+            e.g. loaded with the snapshot; computed when omitted.
+
+    Returns:
+        The chunks that still need embedding, in their original order.
+    """
+    index = NearDuplicateIndex(threshold)
+    existing = existing or []
+    if signatures is None:
+        signatures = signature_matrix(existing)
+    for doc, signature in zip(existing, signatures):
+        # MinHash values are never negative, so -1 marks a chunk without one.
+        if signature[0] >= 0:
+            index.add(signature, doc)
+    return index.dedup(chunks)
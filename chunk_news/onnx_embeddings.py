@@ -0,0 +1,256 @@
+"""
+Int8-quantized ONNX Runtime backend for the sentence-transformers embedding
+model, for CPU-only hosts where PyTorch dominates import time and query
+latency. Select it with EMBED_BACKEND=onnx (see vector_db.get_embeddings).
+
+The model is exported once, on a machine with torch and transformers:
+    python -m chunk_news.onnx_embeddings export [model_dir]
+which writes the ONNX graph, its dynamically quantized int8 version, the
+tokenizer and validation.json. The last one records how close the int8
+vectors are to the PyTorch ones and the speedup measured. At runtime only
+onnxruntime and tokenizers are needed; both, and onnx for the export, are in
+requirements.txt.
+
+    python -m chunk_news.onnx_embeddings validate [model_dir]
+re-runs the check against the PyTorch model.
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_MODEL_DIR = Path(__file__).parent / "onnx_model"
+ONNX_FILE = "model.onnx"
+QUANTIZED_FILE = "model_int8.onnx"
+VALIDATION_FILE = "validation.json"
+# Minimum cosine similarity between ONNX and PyTorch vectors of the same text.
+MIN_COSINE = 0.99
+# all-MiniLM-L6-v2 truncates its input at 256 tokens.
+MAX_LENGTH = 256
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Mean-pooled, L2-normalized sentence embeddings computed with ONNX Runtime,
+    matching what sentence-transformers returns for all-MiniLM-L6-v2.
+
+    Texts are encoded in length-sorted batches, like ParallelEmbeddings.
+    """
+
+    def __init__(self, model_dir: Path = DEFAULT_MODEL_DIR, batch_size: int = 32, threads: int | None = None):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "EMBED_BACKEND=onnx needs onnxruntime and tokenizers: pip install onnxruntime"
+            ) from e
+
+        self.model_dir = Path(model_dir)
+        self.batch_size = batch_size
+        model_path = self.model_dir / QUANTIZED_FILE
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"No quantized ONNX model at {model_path}. "
+                f"Export one with: python -m chunk_news.onnx_embeddings export {self.model_dir}"
+            )
+
+        validation = read_validation(self.model_dir)
+        if not validation:
+            print(f"❌ Warning: {model_path} has not been validated against the PyTorch model.")
+        elif not validation["passed"]:
+            print(
+                f"❌ Warning: {model_path} failed validation "
+                f"(min cosine {validation['min_cosine']:.4f} < {validation['tolerance']})."
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(MAX_LENGTH)
+        self.tokenizer.enable_padding()
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+        mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embeds texts into a float32 matrix, one row per text."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        parts = [
+            self._encode_batch([texts[i] for i in order[pos:pos + self.batch_size]])
+            for pos in range(0, len(order), self.batch_size)
+        ]
+        sorted_vectors = np.concatenate(parts).astype(np.float32)
+        vectors = np.empty_like(sorted_vectors)
+        vectors[order] = sorted_vectors
+        return vectors
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.encode([text])[0].tolist()
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embeds several queries with one session run per batch."""
+        return self.embed_documents(texts)
+
+
+def read_validation(model_dir: Path) -> dict:
+    """Returns the validation report of an exported model, or an empty dict."""
+    path = Path(model_dir) / VALIDATION_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_onnx(model_name: str, model_dir: Path = DEFAULT_MODEL_DIR):
+    """
+    Exports a HuggingFace sentence-transformers model to ONNX and quantizes
+    its weights to int8.
+
+    Args:
+        model_name: The HuggingFace model id or a local model folder.
+        model_dir: The folder to write the model, tokenizer and report into.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    tokenizer.save_pretrained(str(model_dir))
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["Nvidia unveils a new AI chip"], return_tensors="pt")
+    names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class _Encoder(torch.nn.Module):
+        # Takes the inputs positionally, in `names` order, and returns only
+        # the token states, whatever the transformers forward() signature.
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *tensors):
+            return self.model(**dict(zip(names, tensors))).last_hidden_state
+
+    print(f"🔄 Exporting {model_name} to ONNX...")
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder().eval(),
+            tuple(sample[name] for name in names),
+            str(model_dir / ONNX_FILE),
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+    quantize_dynamic(str(model_dir / ONNX_FILE), str(model_dir / QUANTIZED_FILE), weight_type=QuantType.QInt8)
+    print(f"✅ Quantized ONNX model written to {model_dir / QUANTIZED_FILE}")
+
+
+def validate(
+    reference: Embeddings,
+    model_dir: Path = DEFAULT_MODEL_DIR,
+    texts: list[str] | None = None,
+    tolerance: float = MIN_COSINE,
+) -> dict:
+    """
+    Compares the int8 ONNX vectors with a reference (PyTorch) embedding
+    function, measures the speedup, and stores the result in validation.json.
+
+    Args:
+        reference: The PyTorch embeddings, e.g. HuggingFaceEmbeddings.
+        model_dir: The exported model folder.
+        texts: The texts to compare on; defaults to the data/query headlines.
+        tolerance: Minimum cosine similarity every text must reach.
+
+    Returns:
+        The validation report.
+    """
+    texts = texts or _sample_texts()
+    onnx = OnnxEmbeddings(model_dir)
+
+    # Warm both up so model loading is not timed.
+    reference.embed_documents(texts[:1])
+    onnx.embed_documents(texts[:1])
+
+    def per_query(embed):
+        start = time.perf_counter()
+        vectors = [embed(text) for text in texts]
+        return np.asarray(vectors, dtype=np.float32), (time.perf_counter() - start) / len(texts)
+
+    expected, torch_s = per_query(reference.embed_query)
+    actual, onnx_s = per_query(onnx.embed_query)
+
+    def unit(x):
+        return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+    cosine = np.sum(unit(expected) * unit(actual), axis=1)
+    report = {
+        "texts": len(texts),
+        "tolerance": tolerance,
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(unit(expected) - actual).max()),
+        "passed": bool(cosine.min() >= tolerance),
+        "torch_ms_per_query": torch_s * 1000,
+        "onnx_ms_per_query": onnx_s * 1000,
+        "speedup": torch_s / max(onnx_s, 1e-12),
+    }
+    with open(Path(model_dir) / VALIDATION_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    status = "✅" if report["passed"] else "❌"
+    print(
+        f"{status} ONNX int8 vs PyTorch on {len(texts)} texts: min cosine {report['min_cosine']:.4f} "
+        f"(tolerance {tolerance}), {report['torch_ms_per_query']:.2f}ms -> "
+        f"{report['onnx_ms_per_query']:.2f}ms per query, {report['speedup']:.1f}x speedup"
+    )
+    return report
+
+
+def _sample_texts(limit: int = 200) -> list[str]:
+    texts = []
+    for path in sorted((Path(__file__).parent.parent / "data" / "query").glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        texts += [item["headline"] for items in data.values() for item in items if item.get("headline")]
+    return list(dict.fromkeys(texts))[:limit] or ["Nvidia unveils a new AI chip"]
+
+
+if __name__ == "__main__":
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    from chunk_news.vector_db import EMBED_MODEL
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MODEL_DIR
+    if command == "export":
+        export_onnx(EMBED_MODEL, target)
+    validate(HuggingFaceEmbeddings(model_name=EMBED_MODEL), target)
@@ -0,0 +1,146 @@
+"""
+Shared retrieval server.
+
+Keeps the embedding model and the vector DB snapshots resident in one
+process and serves batched search over local HTTP, so the worker, the three
+leaders and the evaluation scripts do not each load their own copy.
+get_retriever() uses it automatically when it answers at RETRIEVAL_SERVER_URL.
+
+Endpoints:
+    GET  /health  -> {"status": "ok", "snapshots": [...]}
+    POST /search  {"snapshot": "23092025_vector_db", "queries": [...], "k": 3,
+                   "filter": {"category": "Intel"}, "mode": "dense",
+                   "score_threshold": null, "max_k": 10}
+                  -> {"stats": {"below_threshold": 0},
+                      "results": [[{"page_content", "metadata", "score"}, ...], ...]}
+    POST /embed   {"texts": [...]} -> {"vectors": [[...], ...]}
+
+Usage (from the repository root):
+    python -m chunk_news.retrieval_server [port]
+"""
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+from chunk_news.retriever import NewsRetriever, embed_queries
+from chunk_news.vector_db import RETRIEVAL_SERVER_URL, WATCH_SNAPSHOTS, get_embeddings, load_vector, watch_snapshot
+
+SNAPSHOT_ROOT = Path(__file__).parent
+
+
+class RetrievalService:
+    """Loads each snapshot once, on first request, and answers searches on it."""
+
+    def __init__(self, root: Path = SNAPSHOT_ROOT):
+        self.root = root
+        self.embeddings = get_embeddings()
+        self.retrievers = {}
+        self._lock = threading.Lock()
+
+    def retriever(self, snapshot: str) -> NewsRetriever:
+        # Only plain folder names inside the snapshot root may be opened.
+        if not snapshot or Path(snapshot).name != snapshot:
+            raise ValueError(f"Invalid snapshot name: {snapshot!r}")
+        with self._lock:
+            if snapshot not in self.retrievers:
+                path = self.root / snapshot
+                if not path.exists():
+                    raise FileNotFoundError(f"Vector database not found at {path}.")
+                retriever = NewsRetriever(db=load_vector(path, embeddings=self.embeddings))
+                if WATCH_SNAPSHOTS:
+                    # Rebuilt snapshots are swapped in without restarting the server.
+                    watch_snapshot(retriever, path)
+                self.retrievers[snapshot] = retriever
+            return self.retrievers[snapshot]
+
+    def search(self, request: dict) -> dict:
+        retriever = self.retriever(request.get("snapshot", ""))
+        update = {
+            key: request[key] for key in ("mode", "score_threshold", "max_k")
+            if key in request and request[key] != getattr(retriever, key)
+        }
+        if update:
+            retriever = retriever.model_copy(update=update)
+        stats = {}
+        results = retriever.search_with_scores(
+            request.get("queries", []), k=request.get("k"), filter=request.get("filter"), stats=stats
+        )
+        return {
+            "stats": stats,
+            "results": [
+                [
+                    {"page_content": doc.page_content, "metadata": doc.metadata, "score": score}
+                    for doc, score in hits
+                ]
+                for hits in results
+            ]
+        }
+
+    def embed(self, request: dict) -> dict:
+        texts = request.get("texts", [])
+        return {"vectors": embed_queries(self.embeddings, texts).tolist() if texts else []}
+
+
+def make_handler(service: RetrievalService):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/health":
+                self._send(200, {"status": "ok", "snapshots": sorted(service.retrievers)})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            routes = {"/search": service.search, "/embed": service.embed}
+            route = routes.get(urlparse(self.path).path)
+            if route is None:
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                self._send(200, route(request))
+            except (ValueError, FileNotFoundError) as e:
+                # The type lets RemoteRetriever re-raise a MissingFiltersError.
+                self._send(400, {"error": str(e), "error_type": type(e).__name__})
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            # Keep the console for the service's own progress output.
+            pass
+
+    return Handler
+
+
+def serve(port: int):
+    """
+    Runs the retrieval server on localhost until interrupted.
+
+    Args:
+        port: The TCP port to listen on.
+    """
+    service = RetrievalService()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(service))
+    print(f"✅ Retrieval server listening on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    default_port = urlparse(RETRIEVAL_SERVER_URL or "http://127.0.0.1:8765").port or 8765
+    serve(int(sys.argv[1]) if len(sys.argv) > 1 else default_port)
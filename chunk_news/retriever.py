@@ -0,0 +1,684 @@
+import heapq
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+from chunk_news.index_spec import enable_reconstruct, search_parameters
+from chunk_news.sparse_index import reciprocal_rank_fusion
+
+# Placed between the chunks of a combined retrieval context.
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+
+def embed_queries(embeddings: Embeddings, queries: list[str]) -> np.ndarray:
+    """
+    Embeds a list of queries in one forward pass.
+
+    Args:
+        embeddings: The embedding function of the vector DB.
+        queries: The query strings.
+
+    Returns:
+        A float32 matrix with one row per query.
+    """
+    if hasattr(embeddings, "embed_queries"):
+        vectors = embeddings.embed_queries(queries)
+    else:
+        vectors = embeddings.embed_documents(queries)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(queries), -1)
+
+
+class MissingFiltersError(ValueError):
+    """Raised for a filtered search on a vector DB without metadata filters."""
+
+
+def _filter_mask(db, filter: dict | None):
+    """Returns the packed bitmap of the rows matching a filter, or None."""
+    if not filter:
+        return None
+    filters = getattr(db, "metadata_filters", None)
+    if filters is None:
+        raise MissingFiltersError(
+            "This vector DB has no metadata filters; rebuild it from load_news_documents()."
+        )
+    return filters.mask(filter)
+
+
+def search_ids(db, vectors: np.ndarray, k: int, filter: dict | None = None):
+    """
+    Searches the FAISS index of a vector DB with a whole matrix of query
+    vectors in a single index.search call.
+
+    Args:
+        db: The LangChain FAISS database, as returned by load_vector.
+        vectors: Query vectors, one per row.
+        k: Number of results per query.
+        filter: Optional metadata filter such as {"category": "Intel",
+            "date": "2025-09-23"}. Only matching rows are searched.
+
+    Returns:
+        A (scores, ids) pair of (len(vectors), k) arrays, padded with id -1.
+    """
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    if db._normalize_L2:
+        faiss.normalize_L2(vectors)
+
+    params = None
+    mask = _filter_mask(db, filter)
+    if mask is not None:
+        # `mask` backs the selector and must outlive the search call.
+        selector = faiss.IDSelectorBitmap(db.index.ntotal, faiss.swig_ptr(mask))
+        params = search_parameters(db.index, selector)
+    return db.index.search(vectors, k, params=params)
+
+
+def ids_to_hits(db, scores: np.ndarray, ids: np.ndarray) -> list[list[tuple[Document, float]]]:
+    """Turns FAISS-style (scores, ids) arrays into (Document, score) lists."""
+    results = []
+    for row_scores, row_ids in zip(scores, ids):
+        hits = []
+        for score, i in zip(row_scores, row_ids):
+            # Searches pad with -1 when fewer than k rows match.
+            if i == -1:
+                continue
+            doc = db.docstore.search(db.index_to_docstore_id[int(i)])
+            hits.append((doc, float(score)))
+        results.append(hits)
+    return results
+
+
+def search_vectors(
+    db, vectors: np.ndarray, k: int, filter: dict | None = None
+) -> list[list[tuple[Document, float]]]:
+    """
+    Dense search of a vector DB for a matrix of query vectors.
+
+    Args:
+        db: The LangChain FAISS database, as returned by load_vector.
+        vectors: Query vectors, one per row.
+        k: Number of results per query.
+        filter: Optional metadata filter, see search_ids.
+
+    Returns:
+        One list of (Document, score) pairs per query, best first.
+    """
+    if len(vectors) == 0:
+        return []
+    scores, ids = search_ids(db, vectors, k, filter)
+    return ids_to_hits(db, scores, ids)
+
+
+def search_hybrid(
+    db, queries: list[str], vectors: np.ndarray, k: int, fetch_k: int, filter: dict | None = None
+) -> list[list[tuple[Document, float]]]:
+    """
+    Hybrid search: the dense FAISS ranking and the BM25 ranking of fetch_k
+    candidates each are fused with reciprocal rank fusion.
+
+    Args:
+        db: The LangChain FAISS database, as returned by load_vector.
+        queries: The query strings, for the BM25 side.
+        vectors: The matching query vectors, for the dense side.
+        k: Number of results per query.
+        fetch_k: Number of candidates taken from each ranking.
+        filter: Optional metadata filter, see search_ids.
+
+    Returns:
+        One list of (Document, RRF score) pairs per query, highest first.
+    """
+    sparse_index = getattr(db, "sparse_index", None)
+    if sparse_index is None:
+        raise ValueError("This vector DB has no BM25 index; rebuild or convert the snapshot.")
+    if not queries:
+        return []
+    _, dense_ids = search_ids(db, vectors, fetch_k, filter)
+    _, sparse_ids = sparse_index.search(queries, fetch_k, mask=_filter_mask(db, filter))
+    scores, ids = reciprocal_rank_fusion([dense_ids, sparse_ids], k)
+    return ids_to_hits(db, scores, ids)
+
+
+def mmr_select(
+    query_vectors: np.ndarray, candidates: np.ndarray, valid: np.ndarray, k: int, lambda_mult: float
+) -> np.ndarray:
+    """
+    Maximal marginal relevance selection for a batch of queries.
+
+    Each step picks, for every query at once, the candidate maximizing
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected),
+    with cosine similarities from one matrix product per batch.
+
+    Args:
+        query_vectors: (n_queries, d) query vectors.
+        candidates: (n_queries, n, d) candidate vectors per query.
+        valid: (n_queries, n) bool mask of real (non-padding) candidates.
+        k: Number of candidates to select per query.
+        lambda_mult: 1 ranks by relevance only, 0 by diversity only.
+
+    Returns:
+        A (n_queries, k) array of positions into the candidate axis, padded
+        with -1 when a query has fewer than k valid candidates.
+    """
+    def unit(x):
+        return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)
+
+    candidates = unit(candidates)
+    relevance = np.einsum("qnd,qd->qn", candidates, unit(query_vectors))
+    similarity = np.einsum("qnd,qmd->qnm", candidates, candidates)
+
+    n_queries, n = valid.shape
+    rows = np.arange(n_queries)
+    available = valid.copy()
+    redundancy = np.full((n_queries, n), -np.inf, dtype=np.float32)
+    selected = np.full((n_queries, k), -1, dtype=np.int64)
+    for step in range(min(k, n)):
+        # Nothing selected yet means no redundancy penalty.
+        penalty = np.where(np.isinf(redundancy), 0.0, redundancy)
+        score = lambda_mult * relevance - (1 - lambda_mult) * penalty
+        score[~available] = -np.inf
+        best = score.argmax(axis=1)
+        has_pick = available[rows, best]
+        selected[has_pick, step] = best[has_pick]
+        available[rows[has_pick], best[has_pick]] = False
+        redundancy[has_pick] = np.maximum(redundancy[has_pick], similarity[rows[has_pick], best[has_pick]])
+    return selected
+
+
+def candidate_vectors(db, ids: np.ndarray, dim: int) -> np.ndarray:
+    """
+    Reconstructs the vectors of search results from the index, in one batch.
+
+    Args:
+        db: The LangChain FAISS database the ids come from.
+        ids: A (n_queries, n) array of FAISS ids, padded with -1.
+        dim: The vector dimension.
+
+    Returns:
+        A (n_queries, n, dim) float32 array, zero where ids is -1.
+    """
+    valid = ids >= 0
+    unique_ids, inverse = np.unique(ids[valid], return_inverse=True)
+    candidates = np.zeros((*ids.shape, dim), dtype=np.float32)
+    if len(unique_ids):
+        enable_reconstruct(db.index)
+        candidates[valid] = db.index.reconstruct_batch(unique_ids)[inverse]
+    return candidates
+
+
+def search_mmr(
+    db, vectors: np.ndarray, k: int, fetch_k: int, lambda_mult: float = 0.5, filter: dict | None = None
+) -> list[list[tuple[Document, float]]]:
+    """
+    Dense search re-ranked for diversity with maximal marginal relevance.
+
+    fetch_k candidates are retrieved per query, their vectors are
+    reconstructed from the index in one batch, and k of them are chosen with
+    mmr_select, so near-paraphrases of an already chosen chunk lose out to
+    chunks adding new information.
+
+    Args:
+        db: The LangChain FAISS database, as returned by load_vector.
+        vectors: Query vectors, one per row.
+        k: Number of results per query.
+        fetch_k: Number of dense candidates per query.
+        lambda_mult: Relevance/diversity trade-off, see mmr_select.
+        filter: Optional metadata filter, see search_ids.
+
+    Returns:
+        One list of (Document, score) pairs per query in selection order,
+        each with its FAISS score.
+    """
+    if len(vectors) == 0:
+        return []
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    scores, ids = search_ids(db, vectors, fetch_k, filter)
+
+    valid = ids >= 0
+    candidates = candidate_vectors(db, ids, vectors.shape[1])
+    picks = mmr_select(vectors, candidates, valid, k, lambda_mult)
+    picked = picks >= 0
+    rows = np.arange(len(ids))[:, None]
+    safe = np.where(picked, picks, 0)
+    return ids_to_hits(
+        db, np.where(picked, scores[rows, safe], 0), np.where(picked, ids[rows, safe], -1)
+    )
+
+
+def apply_score_threshold(
+    db, results: list[list[tuple[Document, float]]], score_threshold: float, stats: dict | None = None
+) -> list[list[tuple[Document, float]]]:
+    """
+    Drops hits whose relevance is below a threshold.
+
+    Scores are mapped to relevance with the database's LangChain relevance
+    function (the one `similarity_score_threshold` retrieval uses), so the
+    threshold works the same for L2 and inner-product snapshots.
+
+    Args:
+        db: The LangChain FAISS database the hits come from.
+        results: One list of (Document, FAISS score) pairs per query.
+        score_threshold: Minimum relevance, roughly in [0, 1].
+        stats: Optional dict whose "below_threshold" count is increased by
+            the number of hits dropped.
+
+    Returns:
+        The hits that pass, in their original order.
+    """
+    relevance = db._select_relevance_score_fn()
+    kept = [[(doc, score) for doc, score in hits if relevance(score) >= score_threshold] for hits in results]
+    if stats is not None:
+        dropped = sum(map(len, results)) - sum(map(len, kept))
+        stats["below_threshold"] = stats.get("below_threshold", 0) + dropped
+    return kept
+
+
+def select_context(
+    results: list[list[Document]],
+    max_chunks: int | None = None,
+    max_chars: int | None = None,
+    render: Callable[[Document], str] = lambda doc: doc.page_content,
+) -> tuple[list[str], dict]:
+    """
+    Combines the documents retrieved for several queries into one bounded
+    context.
+
+    The queries take turns, best hit first, so every query keeps its top
+    chunk before any query gets its third. Repeated texts are skipped, and
+    chunks that would exceed max_chunks or max_chars are dropped.
+
+    Args:
+        results: One list of Documents per query, best first.
+        max_chunks: Maximum number of chunks in the context, or None.
+        max_chars: Maximum length of the joined context (CONTEXT_SEPARATOR
+            included), or None. About 4 characters make one token.
+        render: Turns a Document into the text placed in the context.
+
+    Returns:
+        The chunk texts to join with CONTEXT_SEPARATOR, and a dict with the
+        "duplicates" and "over_budget" counts.
+    """
+    texts, seen = [], set()
+    stats = {"duplicates": 0, "over_budget": 0}
+    length = 0
+    for rank in range(max(map(len, results), default=0)):
+        for docs in results:
+            if rank >= len(docs):
+                continue
+            text = render(docs[rank])
+            if text in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(text)
+            added = len(text) + (len(CONTEXT_SEPARATOR) if texts else 0)
+            if (max_chunks and len(texts) >= max_chunks) or (max_chars and length + added > max_chars):
+                stats["over_budget"] += 1
+                continue
+            texts.append(text)
+            length += added
+    return texts, stats
+
+
+class NewsRetriever(BaseRetriever):
+    """
+    Retriever over one vector DB snapshot.
+
+    Behaves like `db.as_retriever(search_kwargs={"k": k})` for single queries,
+    and adds `invoke_many` to answer several queries with one embedding pass
+    and one index search. With mode="hybrid" the dense ranking is fused with
+    the snapshot's BM25 ranking, which keeps exact tickers, product codes and
+    names from being blurred by the embedding. With mode="mmr" the dense
+    candidates are re-ranked with maximal marginal relevance so that the k
+    chunks returned are not paraphrases of each other.
+    """
+
+    db: Any
+    k: int = 3
+    # Default metadata filter, e.g. {"category": "Intel"}; see MetadataFilters.
+    filter: dict | None = None
+    # "dense" (FAISS only), "hybrid" (FAISS + BM25 with reciprocal rank fusion)
+    # or "mmr" (FAISS candidates re-ranked for diversity).
+    mode: str = "dense"
+    # Candidates taken from each ranking before fusion or MMR re-ranking.
+    fetch_k: int = 20
+    # MMR trade-off: 1 ranks by relevance only, 0 by diversity only.
+    lambda_mult: float = 0.5
+    # Adaptive k: when set, every hit with at least this relevance is returned,
+    # up to max_k per query, instead of a fixed k. Not applied in hybrid mode,
+    # whose fused rank scores have no absolute scale.
+    score_threshold: float | None = None
+    max_k: int = 10
+
+    def search_with_scores(
+        self, queries: list[str], k: int | None = None, filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Retrieves the top-k chunks and their scores for every query.
+
+        Args:
+            queries: The search queries.
+            k: Number of results per query, defaults to the retriever's k
+                (max_k when a score threshold is set).
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of (Document, score) pairs per query, best first.
+        """
+        if not queries:
+            return []
+        # Read once: a SnapshotWatcher may swap `db` while this call runs.
+        db = self.db
+        vectors = embed_queries(db.embedding_function, queries)
+        adaptive = self.score_threshold is not None and self.mode != "hybrid"
+        k = k or (self.max_k if adaptive else self.k)
+        fetch_k = max(self.fetch_k, k)
+        if self.mode == "hybrid":
+            return search_hybrid(db, queries, vectors, k, fetch_k, filter or self.filter)
+        if self.mode == "mmr":
+            results = search_mmr(db, vectors, k, fetch_k, self.lambda_mult, filter or self.filter)
+        else:
+            results = search_vectors(db, vectors, k, filter or self.filter)
+        if adaptive:
+            results = apply_score_threshold(db, results, self.score_threshold, stats)
+        return results
+
+    def invoke_many(
+        self, queries: list[str], filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[Document]]:
+        """
+        Retrieves documents for several queries at once.
+
+        Args:
+            queries: The search queries.
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of Documents per query, in the order of `queries`.
+        """
+        return [
+            [doc for doc, _ in hits] for hits in self.search_with_scores(queries, filter=filter, stats=stats)
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.invoke_many([query])[0]
+
+
+class MultiDayRetriever(BaseRetriever):
+    """
+    Retriever over several dated vector DB snapshots.
+
+    The queries are embedded once, every snapshot is searched in its own
+    thread (FAISS releases the GIL while searching) and the per-day hits are
+    merged into one top-k list by score. In "hybrid" mode the per-day RRF
+    scores are merged; in "mmr" mode the dense candidates of all days are
+    re-ranked together, so the same story filed on two days is not returned
+    twice. Each returned Document is a copy carrying the date of the snapshot
+    it came from in metadata["snapshot"].
+    """
+
+    # Snapshot label (the DDMMYYYY folder date) -> loaded FAISS database.
+    dbs: dict[str, Any]
+    k: int = 3
+    # Default metadata filter, e.g. {"category": "Intel"}; see MetadataFilters.
+    filter: dict | None = None
+    # "dense", "hybrid" or "mmr", as in NewsRetriever.
+    mode: str = "dense"
+    fetch_k: int = 20
+    lambda_mult: float = 0.5
+    # Adaptive k, as in NewsRetriever.
+    score_threshold: float | None = None
+    max_k: int = 10
+
+    def _merge(self, hits: list[tuple[Document, float]], k: int) -> list[tuple[Document, float]]:
+        db = next(iter(self.dbs.values()))
+        if self.mode == "hybrid" or db.distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT:
+            return heapq.nlargest(k, hits, key=lambda hit: hit[1])
+        # Euclidean (the default for our snapshots): smaller is closer.
+        return heapq.nsmallest(k, hits, key=lambda hit: hit[1])
+
+    @staticmethod
+    def _tag(hits: list[tuple[Document, float]], label: str) -> list[tuple[Document, float]]:
+        # Copies, so the Documents held by the day's docstore are not modified.
+        return [
+            (doc.model_copy(update={"metadata": {**doc.metadata, "snapshot": label}}), score)
+            for doc, score in hits
+        ]
+
+    def _search_mmr(self, vectors: np.ndarray, k: int, fetch_k: int, filter: dict | None):
+        # The fetch_k dense candidates of every day, side by side on one axis.
+        def candidates_of(item):
+            label, day_db = item
+            scores, ids = search_ids(day_db, vectors, fetch_k, filter)
+            return label, day_db, scores, ids, candidate_vectors(day_db, ids, vectors.shape[1])
+
+        with ThreadPoolExecutor(max_workers=len(self.dbs)) as pool:
+            per_day = list(pool.map(candidates_of, self.dbs.items()))
+
+        candidates = np.concatenate([day[4] for day in per_day], axis=1)
+        valid = np.concatenate([day[3] >= 0 for day in per_day], axis=1)
+        picks = mmr_select(vectors, candidates, valid, k, self.lambda_mult)
+
+        results = []
+        for q, row in enumerate(picks):
+            hits = []
+            for pick in row[row >= 0]:
+                label, day_db, scores, ids, _ = per_day[pick // fetch_k]
+                column = pick % fetch_k
+                doc = day_db.docstore.search(day_db.index_to_docstore_id[int(ids[q, column])])
+                hits.extend(self._tag([(doc, float(scores[q, column]))], label))
+            results.append(hits)
+        return results
+
+    def search_with_scores(
+        self, queries: list[str], k: int | None = None, filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Searches every snapshot and returns the merged top-k for every query.
+
+        Args:
+            queries: The search queries.
+            k: Number of results per query, defaults to the retriever's k
+                (max_k when a score threshold is set).
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of (Document, score) pairs per query, best first.
+        """
+        if self.mode not in ("dense", "hybrid", "mmr"):
+            raise ValueError(f"Unknown retrieval mode {self.mode!r}; choose 'dense', 'hybrid' or 'mmr'.")
+        if not self.dbs or not queries:
+            return [[] for _ in queries]
+        adaptive = self.score_threshold is not None and self.mode != "hybrid"
+        k = k or (self.max_k if adaptive else self.k)
+        fetch_k = max(self.fetch_k, k)
+        filter = filter or self.filter
+        db = next(iter(self.dbs.values()))
+        vectors = embed_queries(db.embedding_function, queries)
+
+        if self.mode == "mmr":
+            merged = self._search_mmr(vectors, k, fetch_k, filter)
+            if adaptive:
+                merged = apply_score_threshold(db, merged, self.score_threshold, stats)
+            return merged
+
+        # One dict per day, as the days are searched in parallel.
+        day_stats = {label: {} for label in self.dbs}
+
+        def search_one(item):
+            label, day_db = item
+            if self.mode == "hybrid":
+                per_query = search_hybrid(day_db, queries, vectors, k, fetch_k, filter)
+            else:
+                per_query = search_vectors(day_db, vectors, k, filter)
+            if adaptive:
+                per_query = apply_score_threshold(day_db, per_query, self.score_threshold, day_stats[label])
+            return [self._tag(hits, label) for hits in per_query]
+
+        with ThreadPoolExecutor(max_workers=len(self.dbs)) as pool:
+            per_day = list(pool.map(search_one, self.dbs.items()))
+
+        merged = [
+            self._merge([hit for day in per_day for hit in day[q]], k)
+            for q in range(len(queries))
+        ]
+        if stats is not None and adaptive:
+            dropped = sum(day.get("below_threshold", 0) for day in day_stats.values())
+            stats["below_threshold"] = stats.get("below_threshold", 0) + dropped
+        return merged
+
+    def invoke_many(
+        self, queries: list[str], filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[Document]]:
+        """
+        Retrieves documents for several queries at once.
+
+        Args:
+            queries: The search queries.
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of Documents per query, in the order of `queries`.
+        """
+        return [
+            [doc for doc, _ in hits] for hits in self.search_with_scores(queries, filter=filter, stats=stats)
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.invoke_many([query])[0]
+
+
+def _post_json(url: str, payload: dict, timeout: float) -> dict:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode("utf-8", errors="replace")
+        try:
+            body = json.loads(detail)
+        except ValueError:
+            body = {}
+        if isinstance(body, dict) and body.get("error_type") == MissingFiltersError.__name__:
+            raise MissingFiltersError(body.get("error", detail)) from e
+        raise RuntimeError(f"Retrieval server error {e.code}: {detail}") from e
+
+
+def server_available(url: str, timeout: float = 0.5) -> bool:
+    """
+    Checks whether a retrieval server answers at a URL.
+
+    Args:
+        url: Base URL of the server, e.g. "http://127.0.0.1:8765".
+        timeout: Seconds to wait for the health check.
+
+    Returns:
+        True if the server's /health endpoint responded.
+    """
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+class RemoteRetriever(BaseRetriever):
+    """
+    Thin client for the shared retrieval server (chunk_news/retrieval_server.py).
+
+    It has the same interface as NewsRetriever, but the embedding model and
+    the snapshot stay resident in the server process, so several agents can
+    share one copy instead of each loading their own.
+    """
+
+    url: str
+    # Snapshot folder name inside chunk_news, e.g. "23092025_vector_db".
+    snapshot: str
+    k: int = 3
+    filter: dict | None = None
+    mode: str = "dense"
+    # Adaptive k, as in NewsRetriever; applied by the server.
+    score_threshold: float | None = None
+    max_k: int = 10
+    timeout: float = 60.0
+
+    def search_with_scores(
+        self, queries: list[str], k: int | None = None, filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Retrieves the top-k chunks and their scores for every query.
+
+        Args:
+            queries: The search queries.
+            k: Number of results per query, defaults to the retriever's k
+                (max_k when a score threshold is set).
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of (Document, score) pairs per query, best first.
+        """
+        if not queries:
+            return []
+        payload = {
+            "snapshot": self.snapshot,
+            "queries": list(queries),
+            "k": k or (self.max_k if self.score_threshold is not None else self.k),
+            "filter": filter or self.filter,
+            "mode": self.mode,
+            "score_threshold": self.score_threshold,
+            "max_k": self.max_k,
+        }
+        response = _post_json(f"{self.url}/search", payload, self.timeout)
+        if stats is not None:
+            for key, value in response.get("stats", {}).items():
+                stats[key] = stats.get(key, 0) + value
+        return [
+            [
+                (Document(page_content=hit["page_content"], metadata=hit["metadata"]), hit["score"])
+                for hit in hits
+            ]
+            for hits in response["results"]
+        ]
+
+    def invoke_many(
+        self, queries: list[str], filter: dict | None = None, stats: dict | None = None
+    ) -> list[list[Document]]:
+        """
+        Retrieves documents for several queries with one request.
+
+        Args:
+            queries: The search queries.
+            filter: Metadata filter, defaults to the retriever's filter.
+            stats: Optional dict receiving the "below_threshold" count.
+
+        Returns:
+            One list of Documents per query, in the order of `queries`.
+        """
+        return [
+            [doc for doc, _ in hits] for hits in self.search_with_scores(queries, filter=filter, stats=stats)
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.invoke_many([query])[0]
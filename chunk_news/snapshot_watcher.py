@@ -0,0 +1,113 @@
+"""
+Hot swap of the snapshot behind a live NewsRetriever.
+
+save_snapshot replaces a snapshot folder atomically, so a rebuilt or updated
+day shows up as a new index.faiss under the same path. A SnapshotWatcher
+polls that file from a daemon thread, loads the new snapshot in the
+background while queries keep running on the old one, and then rebinds the
+retriever's `db` in a single assignment. NewsRetriever reads `db` once per
+call, so every query sees exactly one snapshot, and the old one is freed as
+soon as the last query still using it returns.
+"""
+import gc
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable
+
+# Seconds between two checks of a watched snapshot folder.
+SNAPSHOT_POLL_SECONDS = float(os.getenv("SNAPSHOT_POLL_SECONDS", "30"))
+
+
+def snapshot_version(path: Path) -> tuple | None:
+    """
+    Identifies the snapshot currently stored at a path.
+
+    Args:
+        path: The snapshot folder.
+
+    Returns:
+        The (inode, mtime, size) of its index.faiss, or None while the folder
+        is missing, e.g. in the middle of save_snapshot's swap.
+    """
+    try:
+        stat = os.stat(Path(path) / "index.faiss")
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class SnapshotWatcher:
+    """
+    Reloads a retriever's snapshot whenever the folder it came from is rebuilt.
+
+    The watcher holds only a weak reference to the retriever, so its thread
+    ends once the retriever is garbage collected.
+    """
+
+    def __init__(self, retriever, path: Path, load: Callable, interval: float = SNAPSHOT_POLL_SECONDS):
+        """
+        Args:
+            retriever: The retriever whose `db` is replaced, e.g. a NewsRetriever.
+            path: The snapshot folder the retriever was loaded from.
+            load: Called with the path to load the new snapshot. It must not
+                keep a reference to the old database (reuse its embeddings,
+                not the database itself), or the old snapshot is never freed.
+            interval: Seconds between two checks.
+        """
+        self._retriever = weakref.ref(retriever)
+        self.path = Path(path)
+        self.load = load
+        self.interval = interval
+        self.version = snapshot_version(self.path)
+        self.swaps = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"snapshot-watcher-{self.path.name}", daemon=True)
+
+    def start(self) -> "SnapshotWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def check(self) -> bool:
+        """
+        Swaps in the snapshot on disk if it changed since the last load.
+
+        Returns:
+            True if the retriever now uses a newly loaded snapshot.
+        """
+        version = snapshot_version(self.path)
+        if version is None or version == self.version:
+            return False
+        try:
+            db = self.load(self.path)
+        except Exception as e:
+            # A half-replaced folder or a failing rebuild; retried next poll.
+            print(f"❌ Could not reload {self.path}: {e}")
+            return False
+        if snapshot_version(self.path) != version:
+            # Replaced again while loading; load the newer one next time.
+            return False
+
+        retriever = self._retriever()
+        if retriever is None:
+            return False
+        retriever.db = db
+        self.version = version
+        self.swaps += 1
+        del db, retriever
+        # Release the old index and docstore now rather than at the next
+        # collection, so two snapshots are not kept resident.
+        gc.collect()
+        print(f"✅ Swapped in the rebuilt snapshot at {self.path}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self._retriever() is None:
+                return
+            self.check()
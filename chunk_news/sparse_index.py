@@ -0,0 +1,173 @@
+import re
+from pathlib import Path
+
+import numpy as np
+
+# Folder inside a snapshot holding the BM25 inverted index.
+SPARSE_DIR = "bm25"
+# Tickers, product codes and model numbers (H200, MI355X, 18A) stay whole tokens.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over the chunks of a snapshot.
+
+    Postings are stored CSR-style: the postings of term t are
+    doc_ids[indptr[t]:indptr[t + 1]] with matching term frequencies in tfs.
+    Every array is saved as its own .npy file and memory-mapped on load, so
+    opening the index costs little more than reading the vocabulary.
+    """
+
+    def __init__(self, vocab: list[str], indptr, doc_ids, tfs, doc_len, k1: float = 1.5, b: float = 0.75):
+        self.vocab = {term: i for i, term in enumerate(vocab)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.k1 = k1
+        self.b = b
+        self.size = len(doc_len)
+        self.avgdl = float(np.mean(doc_len)) if self.size else 0.0
+
+    @classmethod
+    def build(cls, texts: list[str]) -> "BM25Index":
+        """
+        Builds the index.
+
+        Args:
+            texts: The chunk texts, in index order.
+
+        Returns:
+            The BM25Index.
+        """
+        postings = {}
+        doc_len = np.zeros(len(texts), dtype=np.int32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_len[row] = len(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((row, count))
+
+        vocab = sorted(postings)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term]) for term in vocab], out=indptr[1:])
+        doc_ids = np.empty(indptr[-1], dtype=np.int32)
+        tfs = np.empty(indptr[-1], dtype=np.uint16)
+        for t, term in enumerate(vocab):
+            rows, counts = zip(*postings[term])
+            doc_ids[indptr[t]:indptr[t + 1]] = rows
+            tfs[indptr[t]:indptr[t + 1]] = np.minimum(counts, np.iinfo(np.uint16).max)
+        return cls(vocab, indptr, doc_ids, tfs, doc_len)
+
+    def save(self, path: Path):
+        sparse_dir = Path(path) / SPARSE_DIR
+        sparse_dir.mkdir(exist_ok=True)
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        with open(sparse_dir / "vocab.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(vocab))
+        np.save(sparse_dir / "indptr.npy", self.indptr)
+        np.save(sparse_dir / "doc_ids.npy", self.doc_ids)
+        np.save(sparse_dir / "tfs.npy", self.tfs)
+        np.save(sparse_dir / "doc_len.npy", self.doc_len)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index | None":
+        """Loads the index of a snapshot, or returns None if it has none."""
+        sparse_dir = Path(path) / SPARSE_DIR
+        if not sparse_dir.exists():
+            return None
+        with open(sparse_dir / "vocab.txt", "r", encoding="utf-8") as f:
+            text = f.read()
+        vocab = text.split("\n") if text else []
+        return cls(
+            vocab,
+            np.load(sparse_dir / "indptr.npy", mmap_mode="r"),
+            np.load(sparse_dir / "doc_ids.npy", mmap_mode="r"),
+            np.load(sparse_dir / "tfs.npy", mmap_mode="r"),
+            np.load(sparse_dir / "doc_len.npy"),
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every chunk for a query."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len / max(self.avgdl, 1e-9))
+        for token in set(tokenize(query)):
+            t = self.vocab.get(token)
+            if t is None:
+                continue
+            start, end = self.indptr[t], self.indptr[t + 1]
+            rows = self.doc_ids[start:end]
+            tf = self.tfs[start:end].astype(np.float32)
+            idf = np.log(1 + (self.size - (end - start) + 0.5) / ((end - start) + 0.5))
+            scores[rows] += idf * tf * (self.k1 + 1) / (tf + norm[rows])
+        return scores
+
+    def search(self, queries: list[str], k: int, mask: np.ndarray | None = None):
+        """
+        Returns the top-k chunks of every query.
+
+        Args:
+            queries: The search queries.
+            k: Number of results per query.
+            mask: Optional packed bitmap (see MetadataFilters.mask) of the
+                rows that may be returned.
+
+        Returns:
+            A (scores, ids) pair of (len(queries), k) arrays, best first,
+            padded with id -1 where fewer than k chunks match.
+        """
+        allowed = None
+        if mask is not None:
+            allowed = np.unpackbits(mask, bitorder="little", count=self.size).astype(bool)
+
+        all_scores = np.zeros((len(queries), k), dtype=np.float32)
+        all_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for q, query in enumerate(queries):
+            scores = self.scores(query)
+            if allowed is not None:
+                scores[~allowed] = 0
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            all_scores[q, :len(candidates)] = scores[candidates]
+            all_ids[q, :len(candidates)] = candidates
+        return all_scores, all_ids
+
+
+def reciprocal_rank_fusion(id_lists: list[np.ndarray], k: int, rrf_k: int = 60):
+    """
+    Fuses ranked id lists with reciprocal rank fusion: every list adds
+    1 / (rrf_k + rank) to each id it contains.
+
+    Args:
+        id_lists: One (n_queries, n) array of ranked ids per retriever, padded
+            with -1.
+        k: Number of fused results per query.
+        rrf_k: The RRF damping constant.
+
+    Returns:
+        A (scores, ids) pair of (n_queries, k) arrays, best first, padded with
+        id -1 where fewer than k ids were retrieved.
+    """
+    n_queries = id_lists[0].shape[0]
+    fused_scores = np.zeros((n_queries, k), dtype=np.float32)
+    fused_ids = np.full((n_queries, k), -1, dtype=np.int64)
+    for q in range(n_queries):
+        ids = np.concatenate([ids[q] for ids in id_lists])
+        ranks = np.concatenate([np.arange(ids_list.shape[1]) for ids_list in id_lists])
+        keep = ids >= 0
+        unique, inverse = np.unique(ids[keep], return_inverse=True)
+        totals = np.bincount(inverse, weights=1.0 / (rrf_k + 1 + ranks[keep]), minlength=len(unique))
+        order = np.argsort(-totals, kind="stable")[:k]
+        fused_scores[q, :len(order)] = totals[order]
+        fused_ids[q, :len(order)] = unique[order]
+    return fused_scores, fused_ids
@@ -1,5 +1,8 @@
+import atexit
 import json
-import re
+import pickle
+import shutil
+import sys
 from pathlib import Path
 import os
 from datetime import datetime
@@ -7,39 +10,101 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import faiss
+
 # LangChain and HuggingFace Imports
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
-# This is the new, recommended import path for HuggingFaceEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.documents import Document
+
+from chunk_news.chunk_store import MmapDocstore, RowIdMap, has_chunk_store, write_chunk_store
+from chunk_news.embedding_cache import CachedEmbeddings, EmbeddingCache, QueryEmbeddingCache
+from chunk_news.embedding_engine import ParallelEmbeddings
+from chunk_news.ingest import clean_text, doc_key, iter_chunk_batches, make_splitter, news_document, split_docs
+from chunk_news.index_spec import apply_search_params, build_index, enable_reconstruct, parse_index_spec
+from chunk_news.metadata_index import MetadataFilters
+from chunk_news.near_dup import NearDuplicateIndex, dedup_chunks, load_signatures, save_signatures, signature_matrix
+from chunk_news.onnx_embeddings import DEFAULT_MODEL_DIR, OnnxEmbeddings
+from chunk_news.retriever import MultiDayRetriever, NewsRetriever, RemoteRetriever, server_available
+from chunk_news.snapshot_watcher import SnapshotWatcher
+from chunk_news.sparse_index import BM25Index
 
 # --- Constants ---
 # The name of the folder where the vector database is stored.
 VECTOR_DB_FOLDER = os.getenv("VECTOR_DB_FOLDER")
 # The HuggingFace model used for creating text embeddings.
 EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Sidecar file written next to index.faiss/index.pkl that records which
+# source documents a snapshot already contains.
+MANIFEST_FILE = "manifest.json"
+# Embedding backend: "torch" (sentence-transformers on PyTorch) or "onnx" (the
+# int8-quantized export in ONNX_MODEL_DIR, see onnx_embeddings.py).
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", str(DEFAULT_MODEL_DIR))
+# Folder of the persistent chunk-embedding cache shared by all snapshots.
+# Set EMBED_CACHE_DIR to an empty string to disable the cache.
+EMBED_CACHE_DIR = os.getenv(
+    "EMBED_CACHE_DIR", str(Path(__file__).parent / "embedding_cache")
+)
+# Number of query vectors kept in the in-memory LRU cache (0 disables it),
+# and the file it is persisted to between runs ("" keeps it in memory only).
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_FILE = os.getenv(
+    "QUERY_CACHE_FILE", str(Path(EMBED_CACHE_DIR) / "queries.npz") if EMBED_CACHE_DIR else ""
+)
+# Batch size and number of processes used when embedding chunks.
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "1"))
+# How new snapshots store their chunks: "pickle" (LangChain's index.pkl) or
+# "mmap" (memory-mapped chunk store, see chunk_store.py).
+SNAPSHOT_STORAGE = os.getenv("SNAPSHOT_STORAGE", "pickle")
+# FAISS index type of new snapshots, e.g. "flat", "ivf:nlist=256,nprobe=16",
+# "hnsw:ef_search=64", "sq8" or "pq:m=48" (see index_spec.py).
+INDEX_SPEC = os.getenv("INDEX_SPEC", "flat")
+# Number of processes cleaning and splitting articles in a streaming build.
+TEXT_WORKERS = int(os.getenv("TEXT_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+# Whether chunks that are near-duplicates of an already kept chunk (MinHash/LSH,
+# see near_dup.py) are merged into it instead of being embedded again.
+DEDUP_CHUNKS = os.getenv("DEDUP_CHUNKS", "1") == "1"
+# Whether load_vector memory-maps index.faiss read-only instead of reading it
+# into RAM, so processes opening the same snapshot share the page cache.
+INDEX_MMAP = os.getenv("INDEX_MMAP", "1") == "1"
+# Dated snapshots are folders named like 23092025_vector_db.
+SNAPSHOT_SUFFIX = "_vector_db"
+SNAPSHOT_DATE_FORMAT = "%d%m%Y"
+# Default retrieval mode of get_retriever: "dense", "hybrid" (dense + BM25) or
+# "mmr" (dense re-ranked for diversity).
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense")
+# Adaptive k: minimum relevance (LangChain's 0-1 relevance score) a chunk
+# needs to be returned, up to RETRIEVAL_MAX_K per query; "" keeps a fixed k.
+RETRIEVAL_SCORE_THRESHOLD = (
+    float(os.environ["RETRIEVAL_SCORE_THRESHOLD"]) if os.getenv("RETRIEVAL_SCORE_THRESHOLD") else None
+)
+RETRIEVAL_MAX_K = int(os.getenv("RETRIEVAL_MAX_K", "10"))
+# Shared retrieval server (see retrieval_server.py) that get_retriever uses
+# when it is running; set to "" to always load the snapshot in-process.
+RETRIEVAL_SERVER_URL = os.getenv("RETRIEVAL_SERVER_URL", "http://127.0.0.1:8765")
+# Whether retrievers reload their snapshot in the background when it is
+# rebuilt or updated on disk (see snapshot_watcher.py).
+WATCH_SNAPSHOTS = os.getenv("WATCH_SNAPSHOTS", "1") == "1"
 
 
-def clean_text(text: str) -> str:
+def load_news_documents(path: Path) -> list[Document]:
     """
-    Removes URLs and collapses excess whitespace from a string.
-    Handles None or empty inputs gracefully.
+    Loads news articles from a JSON file, cleans them, and formats them into
+    Documents that keep the article fields as structured metadata.
 
     Args:
-        text: The input string to clean.
+        path: The Path object pointing to the JSON file.
 
     Returns:
-        The cleaned string.
+        A list of Documents whose metadata holds category, date (YYYY-MM-DD),
+        source, headline and url.
     """
-    if not text:
-        return ""
-    # Remove URLs
-    text = re.sub(r"http\S+", "", text)
-    # Reduce multiple whitespace characters to a single space
-    text = re.sub(r"\s+", " ", text).strip()
-    # Remove newlines
-    text = text.replace("\n", " ").replace("\r", " ")
-    return text
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return [news_document(category, item) for category, items in data.items() for item in items]
 
 
 def load_news(path: Path) -> list[str]:
@@ -53,80 +118,486 @@ def load_news(path: Path) -> list[str]:
     Returns:
         A list of formatted strings, where each string is a news document.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    return [doc.page_content for doc in load_news_documents(path)]
+
+
+def get_embeddings(batch_size: int = EMBED_BATCH_SIZE, workers: int = EMBED_WORKERS):
+    """
+    Returns the embedding function used for building and querying vector DBs,
+    wrapped in the on-disk embedding cache and the query LRU cache unless
+    they are disabled.
+
+    Args:
+        batch_size: Number of chunks encoded per forward pass.
+        workers: Number of processes chunks are sharded over when embedding
+            (torch backend only; the ONNX session uses every core itself).
+
+    Returns:
+        A LangChain Embeddings object.
+    """
+    if EMBED_BACKEND == "onnx":
+        embeddings = OnnxEmbeddings(Path(ONNX_MODEL_DIR), batch_size=batch_size)
+        # Cached vectors of the two backends differ slightly; keep them apart.
+        cache_model = f"{EMBED_MODEL}+onnx-int8"
+    elif EMBED_BACKEND == "torch":
+        embeddings = ParallelEmbeddings(EMBED_MODEL, batch_size=batch_size, workers=workers)
+        cache_model = EMBED_MODEL
+    else:
+        raise ValueError(f"Unknown EMBED_BACKEND {EMBED_BACKEND!r}; choose 'torch' or 'onnx'")
+
+    if EMBED_CACHE_DIR:
+        embeddings = CachedEmbeddings(embeddings, EmbeddingCache(Path(EMBED_CACHE_DIR), cache_model))
+    if QUERY_CACHE_SIZE > 0:
+        # all-MiniLM-L6-v2 is uncased, so queries differing only in case share a vector.
+        embeddings = QueryEmbeddingCache(
+            embeddings,
+            max_size=QUERY_CACHE_SIZE,
+            path=QUERY_CACHE_FILE or None,
+            model_name=cache_model,
+            lowercase=True,
+        )
+        atexit.register(embeddings.save)
+    return embeddings
 
-    docs = []
-    for category, items in data.items():
-        for item in items:
-            content = clean_text(item.get("content", ""))
-            full_text = (
-                f"Category: {category}\n"
-                f"Headline: {item.get('headline','')}\n"
-                f"Source: {item.get('source','')}\n"
-                f"Content: {content}\n"
-                f"Timestamp: {item.get('timestamp','')}"
-            )
-            docs.append(full_text)
-    return docs
 
+def _as_documents(docs: list[str | Document]) -> list[Document]:
+    return [doc if isinstance(doc, Document) else Document(page_content=doc) for doc in docs]
 
-def build_vector_db(docs: list[str], save_path: Path):
+
+def read_manifest(path: Path) -> dict:
+    """
+    Reads the manifest of a vector DB snapshot.
+
+    Args:
+        path: The directory path where the vector database is stored.
+
+    Returns:
+        The manifest as a dict, or an empty dict for snapshots built before
+        manifests existed.
+    """
+    manifest_path = Path(path) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(path: Path, manifest: dict):
+    """Rewrites the manifest of a snapshot in place, leaving its index untouched."""
+    manifest_path = Path(path) / MANIFEST_FILE
+    tmp_path = manifest_path.with_name(f"{MANIFEST_FILE}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def save_snapshot(
+    vectordb, save_path: Path, manifest: dict, storage: str = "pickle", signatures=None
+):
+    """
+    Saves a vector DB and its manifest into a temporary sibling folder and then
+    swaps it into place, so readers never see a half-written snapshot.
+
+    Args:
+        vectordb: The FAISS database to save.
+        save_path: The directory path where the vector database will be saved.
+        manifest: The manifest to store alongside the index.
+        storage: "pickle" for LangChain's index.pkl docstore, or "mmap" for
+            the memory-mapped chunk store.
+        signatures: MinHash signatures of the first chunks, e.g. loaded with
+            the snapshot being updated. With DEDUP_CHUNKS on, the signatures
+            of the remaining chunks are computed and all of them are saved
+            for the next update.
+    """
+    if storage not in ("pickle", "mmap"):
+        raise ValueError(f"Unknown snapshot storage: {storage!r}")
+
+    save_path = Path(save_path)
+    tmp_path = save_path.with_name(f".{save_path.name}.tmp-{os.getpid()}")
+    old_path = save_path.with_name(f".{save_path.name}.old-{os.getpid()}")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+
+    documents = [
+        vectordb.docstore.search(vectordb.index_to_docstore_id[i])
+        for i in range(vectordb.index.ntotal)
+    ]
+    if storage == "mmap":
+        tmp_path.mkdir(parents=True)
+        faiss.write_index(vectordb.index, str(tmp_path / "index.faiss"))
+        write_chunk_store(tmp_path, documents)
+    else:
+        vectordb.save_local(str(tmp_path))
+    filters = MetadataFilters.build(documents)
+    if filters.bitmaps:
+        # Without category/date metadata (e.g. built from plain strings) the
+        # snapshot is left unfilterable, so a filtered search raises.
+        filters.save(tmp_path)
+    BM25Index.build([doc.page_content for doc in documents]).save(tmp_path)
+    if DEDUP_CHUNKS:
+        save_signatures(tmp_path, signature_matrix(documents, signatures))
+
+    manifest = {**manifest, "storage": storage}
+    with open(tmp_path / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    if save_path.exists():
+        os.replace(save_path, old_path)
+    os.replace(tmp_path, save_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def convert_snapshot(path: Path, storage: str):
+    """
+    Rewrites an existing vector DB snapshot with a different chunk storage,
+    e.g. to move one of the dated pickle snapshots to the mmap format.
+
+    Args:
+        path: The directory path where the vector database is stored.
+        storage: "pickle" or "mmap".
+    """
+    vectordb = load_vector(path, mmap=False)
+    save_snapshot(vectordb, path, read_manifest(path), storage=storage, signatures=load_signatures(path))
+    print(f"✅ Converted {path} to {storage} storage.")
+
+
+def build_vector_db(
+    docs: list[str | Document],
+    save_path: Path,
+    batch_size: int = EMBED_BATCH_SIZE,
+    workers: int = EMBED_WORKERS,
+    storage: str = SNAPSHOT_STORAGE,
+    index_spec: str = INDEX_SPEC,
+):
     """
     Builds a FAISS vector database from a list of documents and saves it locally.
 
     Args:
-        docs: A list of documents (strings) to process.
+        docs: A list of documents (strings, or Documents from
+            load_news_documents to make the snapshot filterable) to process.
         save_path: The directory path where the vector database will be saved.
+        batch_size: Number of chunks encoded per forward pass.
+        workers: Number of processes chunks are sharded over when embedding.
+        storage: "pickle" or "mmap" chunk storage for the snapshot.
+        index_spec: The FAISS index type, recorded in the manifest so that
+            load_vector restores its search parameters.
     """
     print("Building vector database...")
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500, chunk_overlap=50, separators=["\n\n", "\n", ".", " "]
-    )
-    
-    # CORRECTED LINE: Use create_documents for lists of strings.
-    # This method correctly handles turning your raw text into Document objects before splitting.
-    chunks = splitter.create_documents(docs)
+    parse_index_spec(index_spec)  # fail before embedding on a bad spec
+    splitter = make_splitter()
+
+    # Drop exact duplicates up front; the key is also recorded in the manifest
+    # so that update_vector_db can skip these documents later.
+    keyed_docs = {}
+    for doc in _as_documents(docs):
+        keyed_docs.setdefault(doc_key(doc), doc)
+
+    chunks = split_docs(list(keyed_docs.values()), list(keyed_docs.keys()), splitter)
     print(f"✅ Total chunks created: {len(chunks)}")
+    if DEDUP_CHUNKS:
+        chunks = dedup_chunks(chunks)
 
-    embeddings = HuggingFaceEmbeddings(model_name=EMBED_MODEL)
+    embeddings = get_embeddings(batch_size=batch_size, workers=workers)
     vectordb = FAISS.from_documents(chunks, embeddings)
-    
-    vectordb.save_local(str(save_path))
+    _finish_build(vectordb, save_path, list(keyed_docs.keys()), storage, index_spec)
+
+
+def _finish_build(vectordb, save_path: Path, doc_keys: list[str], storage: str, index_spec: str):
+    """Swaps in the spec's index type and saves a freshly built snapshot."""
+    if parse_index_spec(index_spec)["kind"] != "flat":
+        vectors = vectordb.index.reconstruct_n(0, vectordb.index.ntotal)
+        vectordb.index = build_index(index_spec, vectors)
+        print(f"✅ Built {index_spec} index.")
+
+    manifest = {
+        "embed_model": EMBED_MODEL,
+        "index_spec": index_spec,
+        "doc_keys": doc_keys,
+    }
+    save_snapshot(vectordb, save_path, manifest, storage=storage)
     print(f"✅ Vector DB saved successfully to: {save_path}")
 
 
-def load_vector(path: Path):
+def build_vector_db_from_file(
+    json_path: Path,
+    save_path: Path,
+    batch_size: int = EMBED_BATCH_SIZE,
+    workers: int = EMBED_WORKERS,
+    text_workers: int = TEXT_WORKERS,
+    storage: str = SNAPSHOT_STORAGE,
+    index_spec: str = INDEX_SPEC,
+):
+    """
+    Builds a vector database straight from a news JSON file with the
+    streaming text phase of ingest.py: articles are parsed incrementally,
+    cleaned and split on `text_workers` processes, and every batch of chunks
+    is embedded while the next ones are being prepared. The result is the
+    same snapshot build_vector_db(load_news_documents(json_path)) produces.
+
+    Args:
+        json_path: The news JSON file.
+        save_path: The directory path where the vector database will be saved.
+        batch_size: Number of chunks encoded per forward pass.
+        workers: Number of processes chunks are sharded over when embedding.
+        text_workers: Number of processes cleaning and splitting articles.
+        storage: "pickle" or "mmap" chunk storage for the snapshot.
+        index_spec: The FAISS index type.
+    """
+    print(f"Building vector database from {json_path} (streaming)...")
+    parse_index_spec(index_spec)  # fail before embedding on a bad spec
+    embeddings = get_embeddings(batch_size=batch_size, workers=workers)
+    near_duplicates = NearDuplicateIndex()
+
+    vectordb = None
+    doc_keys, total_chunks = {}, 0
+    for keys, chunks in iter_chunk_batches(json_path, workers=text_workers):
+        # Drop exact duplicates of articles seen in earlier batches.
+        new_keys = {key for key in keys if key not in doc_keys}
+        doc_keys.update(dict.fromkeys(keys))
+        chunks = [chunk for chunk in chunks if chunk.metadata["doc_key"] in new_keys]
+        total_chunks += len(chunks)
+        if DEDUP_CHUNKS:
+            chunks = near_duplicates.dedup(chunks)
+        if not chunks:
+            continue
+        if vectordb is None:
+            vectordb = FAISS.from_documents(chunks, embeddings)
+            ids = list(vectordb.index_to_docstore_id.values())
+        else:
+            ids = vectordb.add_documents(chunks)
+        # The store keeps copies of the chunks; later batches must merge into those.
+        near_duplicates.replace_kept(chunks, [vectordb.docstore.search(i) for i in ids])
+
+    if vectordb is None:
+        raise ValueError(f"No articles found in {json_path}.")
+    print(f"✅ Total chunks created: {total_chunks}")
+    _finish_build(vectordb, save_path, list(doc_keys), storage, index_spec)
+
+
+def _legacy_doc_keys(vectordb, docs: list[Document], splitter: RecursiveCharacterTextSplitter) -> set[str]:
+    """
+    Recovers which documents a snapshot without a manifest already contains,
+    by checking whether every chunk of a document is present in its docstore.
+    """
+    indexed_chunks = {d.page_content for d in vectordb.docstore._dict.values()}
+    known = set()
+    for doc in docs:
+        chunks = splitter.split_text(doc.page_content)
+        if chunks and all(chunk in indexed_chunks for chunk in chunks):
+            known.add(doc_key(doc))
+    return known
+
+
+def update_vector_db(new_docs: list[str | Document], path: Path):
+    """
+    Adds documents to an existing FAISS vector database, chunking and embedding
+    only the documents that are not indexed yet. Falls back to a full build when
+    no database exists at the given path.
+
+    Args:
+        new_docs: A list of documents (strings or Documents), which may overlap with the
+            documents already in the database.
+        path: The directory path where the vector database is stored.
+
+    Returns:
+        The number of newly indexed documents.
+    """
+    path = Path(path)
+    if not path.exists():
+        build_vector_db(new_docs, path)
+        return len({doc_key(doc) for doc in new_docs})
+
+    splitter = make_splitter()
+    # A memory-mapped index is read-only, so load it into RAM to add to it.
+    vectordb = load_vector(path, mmap=False)
+    manifest = read_manifest(path)
+    storage = manifest.get("storage", "pickle")
+    if isinstance(vectordb.docstore, MmapDocstore):
+        # The mmap store is read-only, so decode it once to append to it.
+        vectordb.docstore = vectordb.docstore.to_in_memory()
+        vectordb.index_to_docstore_id = {i: str(i) for i in range(vectordb.index.ntotal)}
+    doc_keys = manifest.get("doc_keys", [])
+    known = set(doc_keys)
+
+    pending = {}
+    for doc in _as_documents(new_docs):
+        key = doc_key(doc)
+        if key not in known:
+            pending.setdefault(key, doc)
+
+    # Snapshots built before manifests existed carry no document keys, so their
+    # documents are recognised by their chunk texts instead.
+    recovered = set()
+    if manifest.get("legacy", "doc_keys" not in manifest):
+        manifest["legacy"] = True
+        recovered = _legacy_doc_keys(vectordb, list(pending.values()), splitter)
+        for key in recovered:
+            doc_keys.append(key)
+            del pending[key]
+
+    if not pending:
+        if recovered:
+            # Record the recovered keys, so the next update does not split
+            # and match these documents all over again.
+            manifest["doc_keys"] = doc_keys
+            write_manifest(path, {**manifest, "storage": storage})
+        print(f"✅ Vector DB at {path} is already up to date.")
+        return 0
+
+    chunks = split_docs(list(pending.values()), list(pending.keys()), splitter)
+    print(f"✅ New documents: {len(pending)}, new chunks: {len(chunks)}")
+    signatures = None
+    if DEDUP_CHUNKS:
+        existing = [
+            vectordb.docstore.search(vectordb.index_to_docstore_id[i])
+            for i in range(vectordb.index.ntotal)
+        ]
+        # Saved with the snapshot; only snapshots saved before signatures
+        # were stored get them computed here, once.
+        signatures = load_signatures(path)
+        if signatures is None or len(signatures) != len(existing):
+            signatures = signature_matrix(existing)
+        chunks = dedup_chunks(chunks, existing=existing, signatures=signatures)
+    if chunks:
+        vectordb.add_documents(chunks)
+
+    manifest["embed_model"] = EMBED_MODEL
+    manifest["doc_keys"] = doc_keys + list(pending.keys())
+    save_snapshot(vectordb, path, manifest, storage=storage, signatures=signatures)
+    print(f"✅ Vector DB updated successfully at: {path}")
+    return len(pending)
+
+
+class ReadOnlyFAISS(FAISS):
+    """
+    FAISS store over a memory-mapped index. FAISS aborts the interpreter when
+    a viewed (mmap) index is modified, so every write raises a RuntimeError
+    instead.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError(
+            "This vector DB was loaded memory-mapped and is read-only; "
+            "load it with load_vector(path, mmap=False) to modify it."
+        )
+
+    add_texts = add_embeddings = add_documents = merge_from = delete = _read_only
+
+
+def _read_index(path: Path, mmap: bool):
+    flags = faiss.IO_FLAG_MMAP_IFC if mmap else 0
+    return faiss.read_index(str(Path(path) / "index.faiss"), flags)
+
+
+def load_vector(path: Path, embeddings=None, index_spec: str | None = None, mmap: bool = INDEX_MMAP):
     """
     Loads an existing FAISS vector database from a local path.
 
     Args:
         path: The directory path where the vector database is stored.
+        embeddings: Embedding function to attach, so several databases can
+            share one model. A new one is created when omitted.
+        index_spec: Optional spec overriding the search parameters stored in
+            the snapshot, e.g. "ivf:nprobe=32". Its kind must match the
+            snapshot's index.
+        mmap: Memory-map the index's vectors read-only instead of copying
+            them into RAM. Such a database cannot be added to: its writes
+            raise a RuntimeError.
 
     Returns:
         The loaded FAISS database object.
     """
     print(f"🔄 Loading vector database from: {path}")
-    embeddings = HuggingFaceEmbeddings(model_name=EMBED_MODEL)
-    # The allow_dangerous_deserialization flag is needed for FAISS with pickle
-    db = FAISS.load_local(str(path), embeddings, allow_dangerous_deserialization=True)
+    if embeddings is None:
+        embeddings = get_embeddings()
+    store = ReadOnlyFAISS if mmap else FAISS
+    if has_chunk_store(path):
+        # Chunks stay on disk and are decoded only for the ids a search returns.
+        index = _read_index(path, mmap)
+        db = store(
+            embedding_function=embeddings,
+            index=index,
+            docstore=MmapDocstore(path),
+            index_to_docstore_id=RowIdMap(index.ntotal),
+        )
+    else:
+        # Same as FAISS.load_local(..., allow_dangerous_deserialization=True),
+        # but reading the index through _read_index.
+        with open(Path(path) / "index.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        db = store(
+            embedding_function=embeddings,
+            index=_read_index(path, mmap),
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+        )
+    stored_spec = read_manifest(path).get("index_spec", "flat")
+    if index_spec and parse_index_spec(index_spec)["kind"] != parse_index_spec(stored_spec)["kind"]:
+        raise ValueError(f"Snapshot at {path} holds a {stored_spec} index, not {index_spec}.")
+    apply_search_params(db.index, index_spec or stored_spec)
+    # MMR re-ranking reconstructs candidate vectors from the index.
+    enable_reconstruct(db.index)
+
+    # Bitmaps for category/date filtered search; None for snapshots whose
+    # chunks have no category or date, or that were built before filters existed.
+    db.metadata_filters = MetadataFilters.load(path)
+    # BM25 inverted index for hybrid retrieval; None for older snapshots.
+    db.sparse_index = BM25Index.load(path)
     print("✅ Vector DB loaded successfully.")
     return db
 
 
-def get_retriever():
+def get_retriever(
+    filter: dict | None = None,
+    mode: str = RETRIEVAL_MODE,
+    index_spec: str | None = None,
+    watch: bool = WATCH_SNAPSHOTS,
+    score_threshold: float | None = RETRIEVAL_SCORE_THRESHOLD,
+    snapshot: str | None = None,
+    embeddings=None,
+):
     """
     Constructs the path to the vector DB, loads it, and returns a retriever.
     This is the primary function to be imported by other scripts like worker.py.
+
+    Args:
+        filter: Optional default metadata filter, e.g. {"category": "Intel"}.
+        mode: "dense", "hybrid" (dense + BM25) or "mmr" (dense re-ranked
+            with maximal marginal relevance).
+        index_spec: Optional search-parameter override such as
+            "hnsw:ef_search=128"; the index type itself comes from the snapshot.
+        watch: Swap in the snapshot in the background when it is rebuilt,
+            so a long-running agent picks up new news without a restart.
+        score_threshold: Minimum relevance of a returned chunk. When set,
+            each query returns every chunk above it, up to RETRIEVAL_MAX_K,
+            instead of a fixed 3.
+        snapshot: The snapshot folder inside chunk_news, e.g.
+            "23092025_vector_db"; defaults to VECTOR_DB_FOLDER.
+        embeddings: Optional embedding function to reuse, e.g. when loading
+            the snapshots of several dates in one process.
     
     Returns:
-        A LangChain retriever object.
+        A NewsRetriever, which can also answer several queries at once
+        through invoke_many. When the shared retrieval server is running, a
+        RemoteRetriever with the same interface is returned instead.
     """
+    if RETRIEVAL_SERVER_URL and index_spec is None and server_available(RETRIEVAL_SERVER_URL):
+        print(f"🔄 Using shared retrieval server at {RETRIEVAL_SERVER_URL}")
+        return RemoteRetriever(
+            url=RETRIEVAL_SERVER_URL,
+            snapshot=snapshot or VECTOR_DB_FOLDER,
+            k=3,
+            filter=filter,
+            mode=mode,
+            score_threshold=score_threshold,
+            max_k=RETRIEVAL_MAX_K,
+        )
+
     # Get the directory where this current file (vector_db.py) is located
     current_dir = Path(__file__).parent
     
     # Build the full, absolute path to the vector database folder
-    db_path = current_dir / VECTOR_DB_FOLDER
+    db_path = current_dir / (snapshot or VECTOR_DB_FOLDER)
     
     if not db_path.exists():
         raise FileNotFoundError(
@@ -134,14 +605,118 @@ def get_retriever():
             f"Please run the build script first."
         )
 
-    db = load_vector(db_path)
+    db = load_vector(db_path, embeddings=embeddings, index_spec=index_spec)
     
     # Configure the database as a retriever to find relevant documents
-    retriever = db.as_retriever(search_kwargs={"k": 3})
+    retriever = NewsRetriever(
+        db=db, k=3, filter=filter, mode=mode, score_threshold=score_threshold, max_k=RETRIEVAL_MAX_K
+    )
+    if watch:
+        watch_snapshot(retriever, db_path, index_spec=index_spec)
     return retriever
 
+
+def watch_snapshot(retriever: NewsRetriever, path: Path, index_spec: str | None = None) -> SnapshotWatcher:
+    """
+    Starts reloading a retriever's snapshot whenever it changes on disk.
+
+    Args:
+        retriever: The NewsRetriever to keep current.
+        path: The snapshot folder it was loaded from.
+        index_spec: Search-parameter override to reapply on every reload.
+
+    Returns:
+        The running SnapshotWatcher.
+    """
+    # Capture the embeddings, not the database, so the old snapshot can be freed.
+    embeddings = retriever.db.embedding_function
+    return SnapshotWatcher(
+        retriever, path, lambda p: load_vector(p, embeddings=embeddings, index_spec=index_spec)
+    ).start()
+
+
+def _parse_date(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    for fmt in ("%Y-%m-%d", SNAPSHOT_DATE_FORMAT):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised date {value!r}; use YYYY-MM-DD or DDMMYYYY.")
+
+
+def list_snapshots(root: Path | None = None) -> dict[datetime, Path]:
+    """
+    Finds the dated vector DB snapshots in a folder.
+
+    Args:
+        root: The folder to scan, defaults to the chunk_news folder.
+
+    Returns:
+        A dict of snapshot date -> snapshot path, sorted by date.
+    """
+    root = Path(root) if root else Path(__file__).parent
+    snapshots = {}
+    for path in root.glob(f"*{SNAPSHOT_SUFFIX}"):
+        try:
+            date = datetime.strptime(path.name[: -len(SNAPSHOT_SUFFIX)], SNAPSHOT_DATE_FORMAT)
+        except ValueError:
+            continue
+        if path.is_dir():
+            snapshots[date] = path
+    return dict(sorted(snapshots.items()))
+
+
+def get_multi_day_retriever(
+    start=None,
+    end=None,
+    k: int = 3,
+    root: Path | None = None,
+    filter: dict | None = None,
+    mode: str = RETRIEVAL_MODE,
+    score_threshold: float | None = RETRIEVAL_SCORE_THRESHOLD,
+):
+    """
+    Loads every dated snapshot inside a date window and returns a retriever
+    that searches them together. It can be used anywhere get_retriever() is.
+
+    Args:
+        start: First day to include (YYYY-MM-DD, DDMMYYYY or datetime), or
+            None for no lower bound.
+        end: Last day to include, or None for no upper bound.
+        k: Number of documents returned per query across all days.
+        root: The folder holding the snapshots, defaults to chunk_news.
+        filter: Optional default metadata filter, e.g. {"category": "Intel"}.
+        mode: "dense", "hybrid" or "mmr", see get_retriever.
+        score_threshold: Minimum relevance of a returned chunk, see get_retriever.
+
+    Returns:
+        A MultiDayRetriever.
+    """
+    start = _parse_date(start) if start else None
+    end = _parse_date(end) if end else None
+    selected = {
+        date: path
+        for date, path in list_snapshots(root).items()
+        if (start is None or date >= start) and (end is None or date <= end)
+    }
+    if not selected:
+        raise FileNotFoundError(f"No vector database snapshots found between {start} and {end}.")
+
+    embeddings = get_embeddings()
+    dbs = {
+        date.strftime(SNAPSHOT_DATE_FORMAT): load_vector(path, embeddings=embeddings)
+        for date, path in selected.items()
+    }
+    print(f"✅ Multi-day retriever over: {', '.join(dbs)}")
+    return MultiDayRetriever(
+        dbs=dbs, k=k, filter=filter, mode=mode, score_threshold=score_threshold, max_k=RETRIEVAL_MAX_K
+    )
+
 # --- Main execution block ---
-# This part of the script will only run when you execute `python vector_db.py` directly.
+# This part of the script will only run when you execute `python -m chunk_news.vector_db`
+# from the repository root.
 # It's useful for building the database for the first time.
 if __name__ == "__main__":
     print("--- Running vector_db.py as a standalone script ---")
@@ -155,14 +730,16 @@ if __name__ == "__main__":
     if not json_path.exists():
         print(f"❌ Error: JSON file not found at {json_path}")
     else:
-        # 1. Load the news documents
-        news_docs = load_news(json_path)
-        print(f"✅ Loaded {len(news_docs)} news items.")
-        
-        # 2. Build and save the vector database
-        build_vector_db(news_docs, save_path)
+        # 1. Build and save the vector database, streaming the articles from
+        #    the file, or only append the new articles when run with --update
+        if "--update" in sys.argv:
+            news_docs = load_news_documents(json_path)
+            print(f"✅ Loaded {len(news_docs)} news items.")
+            update_vector_db(news_docs, save_path)
+        else:
+            build_vector_db_from_file(json_path, save_path)
         
-        # 3. Test the retriever
+        # 2. Test the retriever
         print("\n--- Testing the retriever ---")
         retriever = get_retriever()
         query = "Nvidia acquisition"
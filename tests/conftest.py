@@ -0,0 +1,84 @@
+"""
+Shared fixtures. Tests run without the sentence-transformers model: the
+embedding function is replaced by FakeEmbeddings, a bag-of-words hash that
+gives texts sharing words similar vectors.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import hashlib
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from chunk_news.ingest import news_document
+
+DIM = 64
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = 0
+
+    def _vector(self, text: str) -> list[float]:
+        vector = np.zeros(DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % DIM] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded += len(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._vector(text)
+
+
+ARTICLES = {
+    "Nvidia": [
+        ("Nvidia unveils Blackwell Ultra GPUs for data centers", "2025-09-22T08:00:00"),
+        ("Nvidia invests in OpenAI compute buildout", "2025-09-23T09:30:00"),
+    ],
+    "Intel": [
+        ("Intel foundry wins a new 18A customer", "2025-09-22T10:00:00"),
+        ("Intel cuts costs as PC demand slows", "2025-09-23T11:15:00"),
+    ],
+    "AMD": [
+        ("AMD ships MI355 accelerators to cloud providers", "2025-09-23T12:00:00"),
+    ],
+}
+
+
+def make_articles(articles: dict = ARTICLES) -> list:
+    """Returns the articles as Documents, as load_news_documents would."""
+    return [
+        news_document(
+            category,
+            {
+                "headline": headline,
+                "content": f"{headline}. Analysts expect the {category} news to move chip stocks this week.",
+                "source": f"{category} Wire",
+                "url": f"https://example.com/{category.lower()}/{i}",
+                "timestamp": timestamp,
+            },
+        )
+        for category, items in articles.items()
+        for i, (headline, timestamp) in enumerate(items)
+    ]
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch) -> FakeEmbeddings:
+    """Makes vector_db build, update and load snapshots with FakeEmbeddings."""
+    import chunk_news.vector_db as vector_db
+
+    embeddings = FakeEmbeddings()
+    monkeypatch.setattr(vector_db, "get_embeddings", lambda *args, **kwargs: embeddings)
+    return embeddings
+
+
+@pytest.fixture
+def articles() -> list:
+    return make_articles()
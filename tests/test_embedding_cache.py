@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+
+from chunk_news.embedding_cache import CachedEmbeddings, EmbeddingCache, QueryEmbeddingCache
+from conftest import FakeEmbeddings
+
+
+def test_put_and_get_across_instances(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model")
+    keys = [cache.key("a"), cache.key("b")]
+    cache.put(keys, [[1, 2, 3], [4, 5, 6]])
+    cache.put([cache.key("c")], [[7, 8, 9]])
+
+    reopened = EmbeddingCache(tmp_path, "model")
+    hits = reopened.get([cache.key("c"), cache.key("a"), cache.key("missing")])
+    assert hits[0].tolist() == [7, 8, 9]
+    assert hits[1].tolist() == [1, 2, 3]
+    assert hits[2] is None
+    assert len(reopened) == 3
+
+
+def test_keys_depend_on_the_model(tmp_path):
+    assert EmbeddingCache(tmp_path, "a").key("text") != EmbeddingCache(tmp_path, "b").key("text")
+
+
+def test_files_are_read_on_first_use(tmp_path):
+    EmbeddingCache(tmp_path, "model").put(["00" * 32], [[1.0, 2.0]])
+    cache = EmbeddingCache(tmp_path, "model")
+    assert cache._rows is None
+    cache.get(["00" * 32])
+    assert cache._rows is not None
+
+
+def test_rows_of_an_interrupted_put_are_dropped(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model")
+    cache.put([cache.key("a")], [[1.0, 2.0]])
+    # A run that died after appending its vector but before its key.
+    with open(tmp_path / EmbeddingCache.VECTORS_FILE, "ab") as f:
+        f.write(np.array([9.0, 9.0], dtype=np.float32).tobytes())
+
+    reopened = EmbeddingCache(tmp_path, "model")
+    reopened.put([cache.key("b")], [[3.0, 4.0]])
+    again = EmbeddingCache(tmp_path, "model")
+    assert [v.tolist() for v in again.get([cache.key("a"), cache.key("b")])] == [[1.0, 2.0], [3.0, 4.0]]
+
+
+def test_legacy_index_is_converted(tmp_path):
+    key = EmbeddingCache(tmp_path, "model").key("a")
+    np.array([[0, 0], [1, 2]], dtype=np.float32).tofile(tmp_path / EmbeddingCache.VECTORS_FILE)
+    with open(tmp_path / EmbeddingCache.LEGACY_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump({"model": "model", "dim": 2, "rows": {key: 1}}, f)
+
+    cache = EmbeddingCache(tmp_path, "model")
+    assert cache.get([key])[0].tolist() == [1, 2]
+    assert not (tmp_path / EmbeddingCache.LEGACY_INDEX_FILE).exists()
+
+
+def test_cached_embeddings_embed_each_text_once(tmp_path):
+    base = FakeEmbeddings()
+    embeddings = CachedEmbeddings(base, EmbeddingCache(tmp_path, "model"))
+    first = embeddings.embed_documents(["a b", "c d", "a b"])
+    assert base.embedded == 2
+
+    second = CachedEmbeddings(base, EmbeddingCache(tmp_path, "model")).embed_documents(["c d", "a b", "e f"])
+    assert base.embedded == 3
+    assert np.allclose(second[:2], [first[1], first[0]])
+
+
+def test_queries_skip_the_disk_cache(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model")
+    embeddings = CachedEmbeddings(FakeEmbeddings(), cache)
+    embeddings.embed_query("nvidia")
+    assert cache._rows is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_query_cache_counts_hits_and_evicts(tmp_path):
+    cache = QueryEmbeddingCache(FakeEmbeddings(), max_size=2, lowercase=True)
+    cache.embed_queries(["Nvidia  news", "nvidia news", "Intel"])
+    assert cache.stats() == {"hits": 0, "misses": 2, "size": 2}
+    cache.embed_query("NVIDIA news")
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2}
+    # "intel" is now the least recently used query.
+    cache.embed_query("AMD")
+    cache.embed_query("intel")
+    assert cache.stats() == {"hits": 1, "misses": 4, "size": 2}
+
+
+def test_query_cache_saves_merge_with_the_file(tmp_path):
+    path = tmp_path / "queries.npz"
+    first = QueryEmbeddingCache(FakeEmbeddings(), max_size=10, path=path, model_name="model")
+    second = QueryEmbeddingCache(FakeEmbeddings(), max_size=10, path=path, model_name="model")
+    first.embed_queries(["a", "b"])
+    second.embed_queries(["c"])
+    first.save()
+    second.save()
+
+    reloaded = QueryEmbeddingCache(FakeEmbeddings(), max_size=10, path=path, model_name="model")
+    assert sorted(reloaded._vectors) == ["a", "b", "c"]
+    assert len(QueryEmbeddingCache(FakeEmbeddings(), path=path, model_name="other")) == 0
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from chunk_news.metadata_index import FILTERS_FILE, MetadataFilters
+from chunk_news.retriever import MissingFiltersError, NewsRetriever, search_hybrid, search_mmr, search_vectors
+from chunk_news.vector_db import build_vector_db, convert_snapshot, load_vector
+
+
+def _rows(filters: MetadataFilters, criteria: dict) -> list[int]:
+    bits = np.unpackbits(filters.mask(criteria), bitorder="little", count=filters.size)
+    return np.flatnonzero(bits).tolist()
+
+
+@pytest.fixture
+def filters() -> MetadataFilters:
+    return MetadataFilters.build([
+        Document(page_content="a", metadata={"category": "Nvidia", "date": "2025-09-22T08:00:00"}),
+        Document(page_content="b", metadata={"category": "Intel", "date": "2025-09-22"}),
+        Document(page_content="c", metadata={"category": "Nvidia", "date": "2025-09-23"}),
+        Document(page_content="d", metadata={}),
+        Document(
+            page_content="e",
+            metadata={
+                "category": "AMD",
+                "date": "2025-09-23",
+                "sources": [{"category": "AMD"}, {"category": "Intel", "date": "2025-09-24"}],
+            },
+        ),
+    ])
+
+
+def test_values_are_normalized(filters):
+    assert filters.values("category") == ["amd", "intel", "nvidia"]
+    assert filters.values("date") == ["2025-09-22", "2025-09-23", "2025-09-24"]
+
+
+def test_mask_matches_case_insensitively_and_per_day(filters):
+    assert _rows(filters, {"category": "NVIDIA"}) == [0, 2]
+    assert _rows(filters, {"date": "2025-09-22T23:59:00"}) == [0, 1]
+
+
+def test_mask_ors_values_and_ands_fields(filters):
+    assert _rows(filters, {"category": ["Nvidia", "Intel"]}) == [0, 1, 2, 4]
+    assert _rows(filters, {"category": ["Nvidia", "Intel"], "date": "2025-09-22"}) == [0, 1]
+    assert _rows(filters, {"category": "Qualcomm"}) == []
+
+
+def test_merged_chunks_match_every_source(filters):
+    assert _rows(filters, {"category": "Intel"}) == [1, 4]
+    assert _rows(filters, {"date": "2025-09-24"}) == [4]
+
+
+def test_unknown_field_raises(filters):
+    with pytest.raises(ValueError):
+        filters.mask({"source": "Reuters"})
+
+
+def test_save_and_load(tmp_path, filters):
+    assert MetadataFilters.load(tmp_path) is None
+    filters.save(tmp_path)
+    loaded = MetadataFilters.load(tmp_path)
+    assert loaded.size == filters.size
+    assert _rows(loaded, {"category": "Nvidia", "date": "2025-09-23"}) == [2]
+
+
+def test_filtered_search_returns_only_matching_chunks(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path)
+    assert (path / FILTERS_FILE).exists()
+    db = load_vector(path, mmap=False)
+    vectors = np.asarray(fake_embeddings.embed_documents(["Nvidia chip news"]), dtype=np.float32)
+    criteria = {"category": "Intel", "date": "2025-09-23"}
+
+    for hits in (
+        search_vectors(db, vectors, 3, criteria)[0],
+        search_hybrid(db, ["Nvidia chip news"], vectors, 3, 10, criteria)[0],
+        search_mmr(db, vectors, 3, 10, filter=criteria)[0],
+    ):
+        assert [doc.metadata["headline"] for doc, _ in hits] == ["Intel cuts costs as PC demand slows"]
+
+
+def test_snapshot_without_metadata_is_not_filterable(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db([doc.page_content for doc in articles], path)
+    assert not (path / FILTERS_FILE).exists()
+
+    convert_snapshot(path, "mmap")
+    assert not (path / FILTERS_FILE).exists()
+    db = load_vector(path, mmap=False)
+    assert db.metadata_filters is None
+
+    vectors = np.asarray(fake_embeddings.embed_documents(["Nvidia chip news"]), dtype=np.float32)
+    criteria = {"category": "Intel"}
+    with pytest.raises(MissingFiltersError):
+        search_vectors(db, vectors, 3, criteria)
+    with pytest.raises(MissingFiltersError):
+        search_hybrid(db, ["Nvidia chip news"], vectors, 3, 10, criteria)
+    with pytest.raises(MissingFiltersError):
+        search_mmr(db, vectors, 3, 10, filter=criteria)
+    assert len(search_vectors(db, vectors, 3)[0]) == 3
+
+
+def test_worker_tool_falls_back_to_unfiltered_search(tmp_path, fake_embeddings, articles):
+    from agents import registry
+    from agents.worker import local_retriever_tool
+
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db([doc.page_content for doc in articles], path)
+    registry.provide("retriever", NewsRetriever(db=load_vector(path, mmap=False)))
+    try:
+        context = local_retriever_tool(queries=["Intel foundry"], chipmaker="Intel", date="2025-09-22")
+    finally:
+        registry.reset("retriever")
+    assert context.startswith("(This news database cannot be filtered")
+    assert "Intel foundry wins a new 18A customer" in context
@@ -0,0 +1,42 @@
+import pytest
+
+from chunk_news.retriever import MultiDayRetriever
+from chunk_news.vector_db import build_vector_db, get_multi_day_retriever
+from conftest import ARTICLES, make_articles
+
+
+@pytest.fixture
+def root(tmp_path, fake_embeddings):
+    # The same Nvidia story was indexed on both days.
+    first_day = make_articles({"Nvidia": ARTICLES["Nvidia"], "Intel": ARTICLES["Intel"]})
+    second_day = make_articles({"Nvidia": ARTICLES["Nvidia"][:1], "AMD": ARTICLES["AMD"]})
+    build_vector_db(first_day, tmp_path / "22092025_vector_db")
+    build_vector_db(second_day, tmp_path / "23092025_vector_db")
+    return tmp_path
+
+
+@pytest.mark.parametrize("mode", ["dense", "hybrid", "mmr"])
+def test_hits_are_tagged_copies(root, mode):
+    retriever = get_multi_day_retriever("2025-09-22", "2025-09-23", k=3, root=root, mode=mode)
+    hits = retriever.invoke_many(["Nvidia Blackwell Ultra GPUs"])[0]
+    assert {doc.metadata["snapshot"] for doc in hits} <= {"22092025", "23092025"}
+    assert "Blackwell" in hits[0].page_content
+
+    for db in retriever.dbs.values():
+        for row in range(db.index.ntotal):
+            assert "snapshot" not in db.docstore.search(db.index_to_docstore_id[row]).metadata
+
+
+def test_mmr_returns_a_story_of_two_days_once(root):
+    retriever = get_multi_day_retriever(k=2, root=root, mode="mmr")
+    hits = retriever.invoke_many(["Nvidia Blackwell Ultra GPUs"])[0]
+    assert len({doc.page_content for doc in hits}) == 2
+
+    dense = get_multi_day_retriever(k=2, root=root).invoke_many(["Nvidia Blackwell Ultra GPUs"])[0]
+    assert dense[0].page_content == dense[1].page_content
+
+
+def test_unknown_mode_raises(root):
+    retriever = get_multi_day_retriever(root=root)
+    with pytest.raises(ValueError):
+        MultiDayRetriever(dbs=retriever.dbs, mode="sparse").invoke_many(["Nvidia"])
@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agents.rate_limit import TokenBucket, retry_after_seconds
+
+
+@pytest.mark.parametrize("requests_per_minute, burst", [(0, 3), (-5, 3), (10, 0)])
+def test_invalid_settings_raise(requests_per_minute, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(requests_per_minute, burst)
+
+
+def test_burst_is_served_without_waiting():
+    bucket = TokenBucket(60, burst=3)
+    assert [bucket.acquire() < 0.01 for _ in range(3)] == [True, True, True]
+    assert bucket.stats()["requests"] == 3
+    assert bucket.stats()["waits"] == 0
+
+
+def test_empty_bucket_waits_for_the_refill():
+    # 600 requests per minute refill one token every 0.1s.
+    bucket = TokenBucket(600, burst=1)
+    bucket.acquire()
+    waited = bucket.acquire()
+    assert 0.05 < waited < 0.5
+    assert bucket.stats()["waits"] == 1
+
+
+def test_block_holds_back_every_request():
+    bucket = TokenBucket(6000, burst=5)
+    bucket.block(0.2)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+    assert bucket.stats()["rate_limited"] == 1
+
+
+def test_buckets_sharing_a_file_share_the_tokens(tmp_path):
+    path = str(tmp_path / "bucket.json")
+    first = TokenBucket(600, burst=2, path=path)
+    second = TokenBucket(600, burst=2, path=path)
+    first.acquire()
+    first.acquire()
+    assert second.acquire() > 0.05
+
+
+def _error(headers: dict, body=None):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers), body=body)
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(_error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(_error({"retry-after": "7"})) == 7.0
+    body = {"error": {"details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "31s"}]}}
+    assert retry_after_seconds(_error({}, body)) == 31.0
+    assert retry_after_seconds(_error({})) is None
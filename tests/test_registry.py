@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from agents import registry
+
+BUILDS = []
+
+
+def build_resource():
+    BUILDS.append(threading.current_thread().name)
+    return object()
+
+
+def build_slowly():
+    time.sleep(0.3)
+    return build_resource()
+
+
+@pytest.fixture(autouse=True)
+def test_factories(monkeypatch):
+    monkeypatch.setitem(registry.FACTORIES, "resource", "test_registry:build_resource")
+    monkeypatch.setitem(registry.FACTORIES, "slow", "test_registry:build_slowly")
+    BUILDS.clear()
+    yield
+    registry.reset("resource")
+    registry.reset("slow")
+
+
+def test_get_builds_once():
+    assert not registry.is_built("resource")
+    first = registry.get("resource")
+    assert registry.get("resource") is first
+    assert registry.is_built("resource")
+    assert len(BUILDS) == 1
+
+
+def test_reset_and_provide():
+    first = registry.get("resource")
+    registry.reset("resource")
+    assert registry.get("resource") is not first
+
+    provided = object()
+    registry.provide("resource", provided)
+    assert registry.get("resource") is provided
+
+
+def test_unknown_name_raises():
+    with pytest.raises(KeyError):
+        registry.get("no_such_agent")
+
+
+def test_concurrent_gets_share_one_build():
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(BUILDS) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_slow_build_does_not_block_other_names():
+    thread = threading.Thread(target=registry.get, args=("slow",))
+    thread.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    registry.get("resource")
+    assert time.monotonic() - start < 0.2
+    thread.join()
@@ -0,0 +1,81 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from chunk_news.near_dup import dedup_chunks
+from chunk_news.retriever import mmr_select, select_context
+from chunk_news.sparse_index import BM25Index, reciprocal_rank_fusion
+
+STORY = (
+    "Nvidia said on Tuesday it will invest up to 100 billion dollars in OpenAI as the two companies "
+    "sign a letter of intent to deploy ten gigawatts of Nvidia systems for OpenAI's next generation "
+    "of AI infrastructure, with the first gigawatt coming online in the second half of 2026."
+)
+
+
+def test_bm25_ranks_exact_terms_and_respects_the_mask(tmp_path):
+    index = BM25Index.build([
+        "Intel 18A yields improve at the Arizona fab",
+        "AMD MI355 accelerators ship to cloud providers",
+        "Nvidia GB300 racks ship to cloud providers",
+    ])
+    _, ids = index.search(["MI355 cloud"], 2)
+    assert ids[0].tolist() == [1, 2]
+
+    mask = np.packbits(np.array([True, False, True]), bitorder="little")
+    _, ids = index.search(["MI355 cloud"], 2, mask=mask)
+    assert ids[0].tolist() == [2, -1]
+
+    index.save(tmp_path)
+    assert BM25Index.load(tmp_path).search(["18A"], 1)[1][0].tolist() == [0]
+
+
+def test_reciprocal_rank_fusion_prefers_ids_ranked_by_both():
+    dense = np.array([[5, 1, 2, -1]])
+    sparse = np.array([[5, 7, 2, -1]])
+    scores, ids = reciprocal_rank_fusion([dense, sparse], 3)
+    assert ids[0].tolist() == [5, 2, 1]
+    assert scores[0, 0] > scores[0, 2]
+
+    _, ids = reciprocal_rank_fusion([np.array([[3, -1]]), np.array([[-1, -1]])], 3)
+    assert ids[0].tolist() == [3, -1, -1]
+
+
+def test_mmr_skips_near_copies():
+    query = np.array([[1.0, 0.0, 0.0]])
+    candidates = np.array([[[1.0, 0.1, 0.0], [1.0, 0.11, 0.0], [0.7, 0.0, 0.7]]])
+    valid = np.ones((1, 3), dtype=bool)
+
+    assert mmr_select(query, candidates, valid, 2, lambda_mult=1.0)[0].tolist() == [0, 1]
+    assert mmr_select(query, candidates, valid, 2, lambda_mult=0.5)[0].tolist() == [0, 2]
+
+    valid[0, 2] = False
+    assert mmr_select(query, candidates, valid, 3, lambda_mult=0.5)[0].tolist() == [0, 1, -1]
+
+
+def test_dedup_merges_syndicated_copies():
+    chunks = [
+        Document(page_content=f"Source: Reuters\n{STORY}", metadata={"source": "Reuters", "category": "Nvidia"}),
+        Document(page_content=f"Source: Yahoo\n{STORY}", metadata={"source": "Yahoo", "category": "Nvidia"}),
+        Document(page_content="Intel cuts costs as PC demand slows in Europe and Asia.", metadata={"source": "CNBC"}),
+    ]
+    kept = dedup_chunks(chunks)
+    assert [doc.metadata["source"] for doc in kept] == ["Reuters", "CNBC"]
+    assert [entry["source"] for entry in kept[0].metadata["sources"]] == ["Reuters", "Yahoo"]
+
+    # A later copy of a story already in the index is merged into it.
+    again = Document(page_content=f"Source: MarketWatch\n{STORY}", metadata={"source": "MarketWatch"})
+    assert dedup_chunks([again], existing=kept) == []
+    assert kept[0].metadata["sources"][-1]["source"] == "MarketWatch"
+
+
+def test_select_context_takes_turns_and_keeps_to_the_budget():
+    def docs(*texts):
+        return [Document(page_content=text) for text in texts]
+
+    results = [docs("a1", "a2", "a3"), docs("b1", "a1", "b3")]
+    texts, stats = select_context(results, max_chunks=4)
+    assert texts == ["a1", "b1", "a2", "a3"]
+    assert stats == {"duplicates": 1, "over_budget": 1}
+
+    texts, _ = select_context(results, max_chars=len("a1") + len("b1") + 10)
+    assert texts == ["a1", "b1"]
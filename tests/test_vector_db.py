@@ -0,0 +1,125 @@
+import faiss
+import pytest
+
+from chunk_news.chunk_store import MmapDocstore
+from chunk_news.retriever import search_vectors
+from chunk_news.vector_db import (
+    ReadOnlyFAISS,
+    build_vector_db,
+    convert_snapshot,
+    load_vector,
+    read_manifest,
+    update_vector_db,
+)
+from conftest import make_articles
+
+EXTRA_ARTICLES = {
+    "Nvidia": [("Nvidia and TSMC expand CoWoS packaging capacity", "2025-09-24T07:45:00")],
+    "AMD": [("AMD wins a supercomputer contract in Europe", "2025-09-24T13:20:00")],
+}
+
+
+def _texts(db) -> list[str]:
+    return [db.docstore.search(db.index_to_docstore_id[i]).page_content for i in range(db.index.ntotal)]
+
+
+def _search(db, query: str, k: int = 1):
+    return search_vectors(db, db.embeddings.embed_documents([query]), k)[0]
+
+
+@pytest.mark.parametrize("storage", ["pickle", "mmap"])
+def test_build_and_load_round_trip(tmp_path, fake_embeddings, articles, storage):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path, storage=storage)
+
+    manifest = read_manifest(path)
+    assert manifest["storage"] == storage
+    assert len(manifest["doc_keys"]) == len(articles)
+
+    db = load_vector(path, mmap=False)
+    assert db.index.ntotal > 0
+    assert isinstance(db.docstore, MmapDocstore) == (storage == "mmap")
+    hits = _search(db, articles[2].page_content)
+    assert hits[0][0].page_content == articles[2].page_content
+    assert hits[0][0].metadata["category"] == "Intel"
+    assert hits[0][0].metadata["date"] == "2025-09-22"
+
+
+def test_save_leaves_no_temporary_folders(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles[:2], path)
+    build_vector_db(articles, path)
+
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+    assert len(read_manifest(path)["doc_keys"]) == len(articles)
+
+
+@pytest.mark.parametrize("storage", ["pickle", "mmap"])
+def test_update_embeds_only_new_documents(tmp_path, fake_embeddings, articles, storage):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path, storage=storage)
+    chunks_before = load_vector(path, mmap=False).index.ntotal
+    embedded_before = fake_embeddings.embedded
+
+    extra = make_articles(EXTRA_ARTICLES)
+    assert update_vector_db(articles + extra, path) == len(extra)
+    db = load_vector(path, mmap=False)
+    assert db.index.ntotal == chunks_before + len(extra)
+    assert fake_embeddings.embedded - embedded_before == len(extra)
+    assert read_manifest(path)["storage"] == storage
+    assert _search(db, extra[1].page_content)[0][0].page_content == extra[1].page_content
+
+    # Nothing left to add.
+    assert update_vector_db(articles + extra, path) == 0
+    assert load_vector(path, mmap=False).index.ntotal == db.index.ntotal
+
+
+def test_update_builds_missing_snapshot(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    assert update_vector_db(articles, path) == len(articles)
+    assert load_vector(path, mmap=False).index.ntotal == len(articles)
+
+
+def test_update_recognises_documents_of_legacy_snapshots(tmp_path, fake_embeddings, articles, monkeypatch):
+    import chunk_news.vector_db as vector_db
+
+    monkeypatch.setattr(vector_db, "DEDUP_CHUNKS", False)
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path)
+    # Snapshots saved before manifests existed had only the index files.
+    (path / vector_db.MANIFEST_FILE).unlink()
+
+    assert update_vector_db(articles, path) == 0
+    assert len(read_manifest(path)["doc_keys"]) == len(articles)
+
+
+def test_memory_mapped_snapshot_is_read_only(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path)
+
+    db = load_vector(path, mmap=True)
+    assert isinstance(db, ReadOnlyFAISS)
+    with pytest.raises(RuntimeError):
+        db.add_texts(["Qualcomm enters the data center market"])
+    assert _search(db, articles[0].page_content)[0][0].page_content == articles[0].page_content
+
+
+def test_convert_snapshot_keeps_chunks(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path, storage="pickle")
+    texts = _texts(load_vector(path, mmap=False))
+
+    convert_snapshot(path, "mmap")
+    db = load_vector(path, mmap=False)
+    assert isinstance(db.docstore, MmapDocstore)
+    assert _texts(db) == texts
+
+
+def test_index_spec_is_restored(tmp_path, fake_embeddings, articles):
+    path = tmp_path / "23092025_vector_db"
+    build_vector_db(articles, path, index_spec="hnsw:ef_search=32")
+
+    db = load_vector(path, mmap=False)
+    assert read_manifest(path)["index_spec"] == "hnsw:ef_search=32"
+    assert isinstance(faiss.downcast_index(db.index), faiss.IndexHNSWFlat)
+    assert _search(db, articles[4].page_content)[0][0].page_content == articles[4].page_content